@@ -1,24 +1,53 @@
 from django.utils import timezone
-from django.db.models import Q, F, Window, OuterRef, Subquery, Max
-from django.db.models.functions import Rank
-from rest_framework import viewsets, generics
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.db import connections
+from django.db.models import Q, F, Avg, Min, Max, Case, When, Value, CharField, Window
+from django.db.models.functions import RowNumber
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import viewsets, generics, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from abc import ABC, abstractmethod
-from functools import lru_cache
-from .models import DataPoint, Sensor
-from .serializers import DataPointSerializer, DataPointRoomSensorSerializer, DataPointRoomSerializer
-from .utils import TIMEFRAME_MAP, get_timedelta_from_timeframe, get_start_date, to_bool
-from .filters import DataPointFilter
+from .models import DataPoint
+from .serializers import DataPointSerializer, DataPointRoomSensorSerializer
+from .utils import (
+    TIMEFRAME_MAP, TIMEFRAME_BIN_INTERVALS, DateBin, FirstByTimestamp, LastByTimestamp,
+    get_timedelta_from_timeframe, get_start_date, to_bool, get_sensor_room_map
+)
+from .filters import DataPointFilter, parse_iso_datetime, parse_end_bound, end_bound_q
 import pandas as pd
+import numpy as np
 from django_filters.rest_framework import DjangoFilterBackend
 import logging
+import hashlib
+import orjson
 import time
 from datetime import timedelta
+from operator import itemgetter
 
 # Configurar logger para endpoints
 endpoints_logger = logging.getLogger('core.api.endpoints')
 
+# La ingesta (POST y /bulk/) no invalida estas cachés: con sensores escribiendo cada pocos segundos cada escritura
+# las vaciaría. Una lectura nueva puede tardar hasta el TTL en aparecer en /latest/ y /timeframed/.
+# Segundos que se reutiliza la respuesta de /latest/ para la misma consulta (los sensores reportan cada pocos segundos)
+LATEST_CACHE_TIMEOUT = 5
+# Segundos que se reutiliza la respuesta de /timeframed/ (historial agregado; el bucket más reciente cambia poco en ese lapso)
+TIMEFRAMED_CACHE_TIMEOUT = 30
+
+# Filas por INSERT multi-fila en la ingesta masiva (/bulk/)
+BULK_CREATE_BATCH_SIZE = 500
+# Máximo de lecturas aceptadas por request en /bulk/; listas más largas se rechazan con 400 antes de validarlas
+BULK_MAX_ITEMS = 5000
+# Filas por lote que /export/ trae del cursor (server-side en PostgreSQL) mientras transmite la respuesta
+EXPORT_CHUNK_SIZE = 2000
+# Rango máximo entre start_date (obligatorio) y end_date (o ahora) que acepta /export/
+EXPORT_MAX_RANGE = timedelta(days=31)
+
 def format_time_delta(delta_seconds):
     """Convierte delta de segundos a formato legible (μs, ms, s, o Xm Ys)."""
     if delta_seconds < 0.001:
@@ -32,6 +61,21 @@ def format_time_delta(delta_seconds):
         minutes, seconds = divmod(delta.seconds, 60)
         return f"{minutes}m {seconds:.2f}s"
 
+def payload_etag(data):
+    """ETag del cuerpo de la respuesta: cambia solo si cambian los datos que devolvería el endpoint."""
+    return quote_etag(hashlib.blake2b(orjson.dumps(data, default=str), digest_size=16).hexdigest())
+
+def query_cache_key(prefix, request):
+    """Clave de caché por endpoint y query string completa (incluye filtros y página)."""
+    return f"{prefix}:{hashlib.blake2b(request.get_full_path().encode(), digest_size=16).hexdigest()}"
+
+def log_endpoint(message):
+    """Registra un evento de endpoint precedido por la hora; si DEBUG no está habilitado no lee el reloj."""
+    if endpoints_logger.isEnabledFor(logging.DEBUG):
+        timestamp = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
+        endpoints_logger.debug(f"[{timestamp}] {message}")
+
+
 
 class DataPointViewSet(viewsets.ModelViewSet):
     """
@@ -48,10 +92,13 @@ class DataPointViewSet(viewsets.ModelViewSet):
     **Acciones Personalizadas:**
       - `GET /api/data-point/latest/`: Obtiene el último registro para cada sensor.
       - `GET /api/data-point/timeframed/`: Obtiene registros agregados por un intervalo de tiempo (`timeframe`).
+      - `POST /api/data-point/bulk/`: Crea varios DataPoints a partir de una lista JSON.
+      - `GET /api/data-point/export/`: Transmite todos los registros filtrados como lista JSON, sin paginación.
 
     **Parámetros de Consulta Comunes (aplicables a `list`, `latest`, `timeframed` y potencialmente a endpoints de detalle donde tenga sentido):**
       - `start_date`: Fecha de inicio (ISO8601) para filtrar los datos.
-      - `end_date`: Fecha de fin (ISO8601) para filtrar los datos.
+      - `end_date`: Fecha de fin (ISO8601) para filtrar los datos; si es solo fecha (`YYYY-MM-DD`) incluye el día completo
+        (en `timeframed` la ventana la fija `timeframe` y `end_date` solo la recorta).
       - `sensors`: Lista de nombres de sensores (separados por coma o parámetro múltiple) para filtrar.
       - `metadata`: Booleano (`true`/`false`). Si es `true`, incluye metadatos sobre la consulta en la respuesta.
       - `include_room`: Booleano (`true`/`false`). Si es `true`, incluye el nombre del `room` asociado a cada sensor.
@@ -64,39 +111,121 @@ class DataPointViewSet(viewsets.ModelViewSet):
     filterset_class = DataPointFilter
     filter_backends = [DjangoFilterBackend]
 
+    def filter_queryset(self, queryset):
+        # Sin parámetros de DataPointFilter (p. ej. el sondeo de /latest/) solo aplican los rangos válidos: se evita construir el FilterSet
+        if not any(param in DataPointFilter.base_filters for param in self.request.query_params):
+            return DataPointFilter.apply_metric_ranges(queryset)
+        return super().filter_queryset(queryset)
+
     def list(self, request, *args, **kwargs):
         endpoint = "GET /api/data-point/"
         start_time = time.time()
-        timestamp = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-        endpoints_logger.debug(f"[{timestamp}] ▶️ Iniciando {endpoint}")
+        log_endpoint(f"▶️ Iniciando {endpoint}")
         
         filtered_queryset = self.filter_queryset(self.get_queryset())
         processor = ListData(queryset=filtered_queryset, query_parameters=request.query_params, request=request)
         response = Response(processor.process())
         
-        end_time = time.time()
-        execution_time = end_time - start_time
-        timestamp = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-        endpoints_logger.debug(f"[{timestamp}] ✅ Completado {endpoint} en {format_time_delta(execution_time)}")
+        log_endpoint(f"✅ Completado {endpoint} en {format_time_delta(time.time() - start_time)}")
         
         return response
 
     def create(self, request, *args, **kwargs):
         endpoint = "POST /api/data-point/"
         start_time = time.time()
-        timestamp = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-        endpoints_logger.debug(f"[{timestamp}] ▶️ Iniciando {endpoint}")
+        log_endpoint(f"▶️ Iniciando {endpoint}")
         
         response = super().create(request, *args, **kwargs)
         
-        end_time = time.time()
-        execution_time = end_time - start_time
-        timestamp = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-        endpoints_logger.debug(f"[{timestamp}] ✅ Completado {endpoint} en {format_time_delta(execution_time)}")
+        log_endpoint(f"✅ Completado {endpoint} en {format_time_delta(time.time() - start_time)}")
         
         return response
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Ingesta de varios DataPoints en una sola request.
+
+        Recibe una lista JSON (hasta `BULK_MAX_ITEMS` lecturas) con el mismo formato que `POST /api/data-point/`
+        y la guarda con INSERTs multi-fila (`bulk_create`). Responde `{"created": N}`.
+        """
+        endpoint = "POST /api/data-point/bulk/"
+        start_time = time.time()
+        log_endpoint(f"▶️ Iniciando {endpoint}")
+
+        if isinstance(request.data, list) and len(request.data) > BULK_MAX_ITEMS:
+            return Response(
+                {'detail': f'Se aceptan hasta {BULK_MAX_ITEMS} lecturas por request; se recibieron {len(request.data)}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        data_points = DataPoint.objects.bulk_create(
+            [DataPoint(**item) for item in serializer.validated_data],
+            batch_size=BULK_CREATE_BATCH_SIZE
+        )
+        # Solo el conteo: devolver cada fila creada duplicaría el payload de entrada
+        response = Response({'created': len(data_points)}, status=status.HTTP_201_CREATED)
+
+        log_endpoint(f"✅ Completado {endpoint} con {len(data_points)} registros en {format_time_delta(time.time() - start_time)}")
+
+        return response
+
     @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Exportación completa de los DataPoints filtrados como lista JSON transmitida por partes.
+
+        Acepta los mismos filtros que `GET /api/data-point/`, sin paginación. `start_date` es obligatorio y el rango
+        hasta `end_date` (o hasta ahora) no puede superar `EXPORT_MAX_RANGE`. Las filas se leen del cursor en lotes de
+        `EXPORT_CHUNK_SIZE`, así la memoria no crece con el rango pedido.
+        """
+        endpoint = "GET /api/data-point/export/"
+        log_endpoint(f"▶️ Iniciando {endpoint}")
+
+        start_date = request.query_params.get('start_date')
+        end_date = request.query_params.get('end_date')
+        if not start_date:
+            return Response({'detail': 'start_date es obligatorio en /export/.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            range_start = parse_iso_datetime(start_date)
+            range_end = parse_end_bound(end_date)[0] if end_date else timezone.now()
+        except ValueError:
+            return Response({'detail': 'start_date/end_date deben estar en formato ISO 8601.'}, status=status.HTTP_400_BAD_REQUEST)
+        if range_end - range_start > EXPORT_MAX_RANGE:
+            return Response(
+                {'detail': f'El rango de /export/ no puede superar {EXPORT_MAX_RANGE.days} días.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .order_by('timestamp')
+            .values_list('timestamp', 'sensor', 'metric', 'value')
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+
+        def stream():
+            start_time = time.time()
+            count = 0
+            yield b'['
+            for ts, sensor, metric, value in rows:
+                record = orjson.dumps({
+                    'timestamp': timezone.localtime(ts).isoformat(), 'sensor': sensor, 'metric': metric, 'value': value
+                })
+                yield record if count == 0 else b',' + record
+                count += 1
+            yield b']'
+            log_endpoint(f"✅ Completado {endpoint} con {count} registros en {format_time_delta(time.time() - start_time)}")
+
+        response = StreamingHttpResponse(stream(), content_type='application/json')
+        response['Content-Disposition'] = 'attachment; filename="datapoints.json"'
+        return response
+
+    @action(detail=False, methods=['get'])
+    # no-cache: el navegador revalida siempre (If-None-Match) en lugar de reutilizar la respuesta por heurística
+    @method_decorator(cache_control(no_cache=True))
     def latest(self, request):
         """
         Último registro por sensor.
@@ -105,17 +234,29 @@ class DataPointViewSet(viewsets.ModelViewSet):
         """
         endpoint = "GET /api/data-point/latest/"
         start_time = time.time()
-        timestamp = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-        endpoints_logger.debug(f"[{timestamp}] ▶️ Iniciando {endpoint}")
+        log_endpoint(f"▶️ Iniciando {endpoint}")
         
-        filtered_queryset = self.filter_queryset(self.get_queryset())
-        processor = LatestData(queryset=filtered_queryset, query_parameters=request.GET, request=request)
-        response = Response(processor.process())
+        # Varios dashboards consultan lo mismo cada pocos segundos: una sola consulta por query string y ventana de caché
+        cache_key = query_cache_key('api_latest', request)
+        cached = cache.get(cache_key)
+        if cached is None:
+            filtered_queryset = self.filter_queryset(self.get_queryset())
+            processor = LatestData(queryset=filtered_queryset, query_parameters=request.GET, request=request)
+            try:
+                data = processor.process()
+            except ValueError:
+                return Response({'detail': 'start_date/end_date deben estar en formato ISO 8601.'}, status=status.HTTP_400_BAD_REQUEST)
+            cached = (data, payload_etag(data))
+            cache.set(cache_key, cached, LATEST_CACHE_TIMEOUT)
+        data, etag = cached
+
+        # El ETag sale del mismo cuerpo filtrado: si no cambió desde `If-None-Match`, 304 sin cuerpo
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response(data)
+        response['ETag'] = etag
         
-        end_time = time.time()
-        execution_time = end_time - start_time
-        timestamp = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-        endpoints_logger.debug(f"[{timestamp}] ✅ Completado {endpoint} en {format_time_delta(execution_time)}")
+        log_endpoint(f"✅ Completado {endpoint} en {format_time_delta(time.time() - start_time)}")
         
         return response
 
@@ -129,35 +270,41 @@ class DataPointViewSet(viewsets.ModelViewSet):
         endpoint = "GET /api/data-point/timeframed/"
         timeframe = request.GET.get('timeframe', '4H')
         start_time = time.time()
-        timestamp = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-        endpoints_logger.debug(f"[{timestamp}] ▶️ Iniciando {endpoint} con timeframe={timeframe}")
-
-        filtered_queryset = self.filter_queryset(self.get_queryset())
-        sensors = request.GET.getlist('sensors') or request.GET.get('sensors')
-        if sensors:
-            if isinstance(sensors, str):
-                sensors = [s.strip() for s in sensors.split(',')]
-            filtered_queryset = filtered_queryset.filter(sensor__in=sensors)
-        metrics = request.GET.getlist('metrics') or request.GET.get('metrics')
-        if metrics:
-            if isinstance(metrics, str):
-                metrics = [m.strip() for m in metrics.split(',')]
-            filtered_queryset = filtered_queryset.filter(metric__in=metrics)
-        from_date = request.GET.get('start_date')
-        to_date = request.GET.get('end_date')
-        max_days = 7
-        if from_date and to_date:
-            from_dt = pd.to_datetime(from_date)
-            to_dt = pd.to_datetime(to_date)
-            if (to_dt - from_dt).days > max_days:
-                from_dt = to_dt - pd.Timedelta(days=max_days)
-                filtered_queryset = filtered_queryset.filter(timestamp__gte=from_dt)
-        processor = TimeframedData(queryset=filtered_queryset, query_parameters=request.GET, request=request)
-        response = Response(processor.process())
-        end_time = time.time()
-        execution_time = end_time - start_time
-        timestamp = timezone.now().strftime('%Y-%m-%d %H:%M:%S')
-        endpoints_logger.debug(f"[{timestamp}] ✅ Completado {endpoint} en {format_time_delta(execution_time)}")
+        log_endpoint(f"▶️ Iniciando {endpoint} con timeframe={timeframe}")
+
+        # Los gráficos históricos repiten la misma consulta en cada refresco: se reutiliza por query string
+        cache_key = query_cache_key('api_timeframed', request)
+        data = cache.get(cache_key)
+        if data is None:
+            filtered_queryset = self.filter_queryset(self.get_queryset())
+            # Condiciones adicionales reunidas en un único Q: un solo filter() en lugar de un clon del queryset por condición
+            conditions = Q()
+            sensors = request.GET.getlist('sensors') or request.GET.get('sensors')
+            if sensors:
+                if isinstance(sensors, str):
+                    sensors = [s.strip() for s in sensors.split(',')]
+                conditions &= Q(sensor__in=sensors)
+            metrics = request.GET.getlist('metrics') or request.GET.get('metrics')
+            if metrics:
+                if isinstance(metrics, str):
+                    metrics = [m.strip() for m in metrics.split(',')]
+                conditions &= Q(metric__in=metrics)
+            from_date = request.GET.get('start_date')
+            to_date = request.GET.get('end_date')
+            max_days = 7
+            if from_date and to_date:
+                from_dt = pd.to_datetime(from_date)
+                to_dt = pd.to_datetime(to_date)
+                if (to_dt - from_dt).days > max_days:
+                    from_dt = to_dt - pd.Timedelta(days=max_days)
+                    conditions &= Q(timestamp__gte=from_dt)
+            if conditions:
+                filtered_queryset = filtered_queryset.filter(conditions)
+            processor = TimeframedData(queryset=filtered_queryset, query_parameters=request.GET, request=request)
+            data = processor.process()
+            cache.set(cache_key, data, TIMEFRAMED_CACHE_TIMEOUT)
+        response = Response(data)
+        log_endpoint(f"✅ Completado {endpoint} en {format_time_delta(time.time() - start_time)}")
         return response
 
 
@@ -182,24 +329,16 @@ class DataPointQueryProcessor(generics.GenericAPIView, ABC):
         if self.include_room:
             self.sensor_room_map = self._get_sensor_room_map()
 
-    @lru_cache(maxsize=32)
     def _get_sensor_room_map(self):
-        """Cachea y retorna mapeo sensor -> room.name."""
-        return {
-            sensor.name: sensor.room.name 
-            for sensor in Sensor.objects.select_related('room').all()
-        }
+        """Retorna mapeo sensor -> room.name (cacheado a nivel de proceso en utils)."""
+        return get_sensor_room_map()
     
     def _get_sensor_room_map_filtered(self, sensor_names):
-        """Cachea y retorna mapeo sensor -> room.name para sensores específicos."""
+        """Retorna mapeo sensor -> room.name para sensores específicos, sin consultar la base."""
+        sensor_room_map = self._get_sensor_room_map()
         if not sensor_names:
-            result = self._get_sensor_room_map()
-        else:
-            result = {
-                sensor.name: sensor.room.name 
-                for sensor in Sensor.objects.select_related('room').filter(name__in=sensor_names)
-            }
-        return result
+            return sensor_room_map
+        return {name: sensor_room_map[name] for name in sensor_names if name in sensor_room_map}
 
     def _filter_by_metric_range(self, queryset):
         """Filtra queryset por rangos de métricas válidos (t, h, s) y preserva métricas no definidas."""
@@ -248,6 +387,10 @@ class DataPointQueryProcessor(generics.GenericAPIView, ABC):
             result = DataPointSerializer(queryset, many=True, context=context).data
         return result
 
+    def serialize(self, result):
+        """Convierte el resultado (o la página) de get() en datos de respuesta; por defecto get() ya los entrega listos."""
+        return result
+
     @abstractmethod
     def get(self):
         """Método abstracto para obtener datos; implementado por subclases."""
@@ -255,22 +398,27 @@ class DataPointQueryProcessor(generics.GenericAPIView, ABC):
 
     def process(self):
         """Procesa datos y retorna respuesta formateada, manejando paginación y metadata."""
+        # Un solo reloj por request: la ventana por defecto y el tiempo transcurrido parten del mismo instante
         start_time = timezone.now()
         
         start_date = self.query_parameters.get('start_date') 
         if not start_date:
-            start_date = (timezone.now() - get_timedelta_from_timeframe('1D')).isoformat()
+            start_date = (start_time - get_timedelta_from_timeframe('1D')).isoformat()
 
         end_date = self.query_parameters.get('end_date')
         if not end_date:
-            end_date = timezone.now().isoformat()
+            end_date = start_time.isoformat()
 
         result = self.get()
 
+        # Se pagina antes de serializar: si get() devuelve un queryset, la página se resuelve con LIMIT/OFFSET
+        page = None
         if self.request and hasattr(self, 'paginate_queryset') and self.paginate:
-            paginated = self.paginate_queryset(result)
-            if paginated is not None:
-                result = self.get_paginated_response(paginated).data
+            page = self.paginate_queryset(result)
+        if page is not None:
+            result = self.get_paginated_response(self.serialize(page)).data
+        else:
+            result = self.serialize(result)
 
         if to_bool(self.query_parameters.get('metadata', False)):
             elapsed_time = (timezone.now() - start_time).total_seconds()
@@ -297,19 +445,35 @@ class ListData(DataPointQueryProcessor):
     """Procesador para listar DataPoints filtrados. El filtrado principal es delegado al ViewSet."""
     
     def get(self):
+        # Proyección a tuplas: sin instancias del modelo ni campos que la respuesta no usa
+        queryset = self.queryset.values_list(*self.get_values_list())
         if not self.paginate:
-            queryset_limited = self.queryset[:1000]
+            queryset_limited = queryset[:1000]
         else:
-            queryset_limited = self.queryset
+            # Orden estable para que las páginas (LIMIT/OFFSET) sean consistentes entre requests
+            queryset_limited = queryset if queryset.ordered else queryset.order_by('pk')
             
         if self.include_room:
-            sensor_names = set(queryset_limited.values_list('sensor', flat=True).distinct())
+            # Sin orden: con order_by('pk') el DISTINCT incluiría el id y traería todas las filas
+            sensor_names = set(self.queryset.order_by().values_list('sensor', flat=True).distinct())
             self.sensor_room_map = self._get_sensor_room_map_filtered(sensor_names)
             
-        return self.get_appropriate_serializer(
-            queryset_limited, 
-            include_room=self.include_room
-        )
+        # Se devuelve el queryset sin serializar: process() pagina primero y serialize() convierte solo la página
+        return queryset_limited
+
+    def serialize(self, result):
+        """Arma los registros desde las tuplas con las mismas claves y formato que DataPointSerializer / DataPointRoomSensorSerializer."""
+        if self.include_room:
+            sensor_room_map = self.sensor_room_map or {}
+            return [
+                {'timestamp': timezone.localtime(ts).isoformat(), 'room': sensor_room_map.get(sensor, ''),
+                 'sensor': sensor, 'metric': metric, 'value': value}
+                for ts, sensor, metric, value in result
+            ]
+        return [
+            {'timestamp': timezone.localtime(ts).isoformat(), 'sensor': sensor, 'metric': metric, 'value': value}
+            for ts, sensor, metric, value in result
+        ]
 
 
 class LatestData(DataPointQueryProcessor):
@@ -318,46 +482,47 @@ class LatestData(DataPointQueryProcessor):
         start_date = self.query_parameters.get('start_date')
         end_date = self.query_parameters.get('end_date')
         if not end_date:
-            end_date = timezone.now()
+            end_date, end_inclusive = timezone.now(), True
         else:
-            end_date = timezone.make_aware(timezone.datetime.fromisoformat(end_date))
+            # Con fecha sola (YYYY-MM-DD) se incluye el día completo, igual que en DataPointFilter
+            end_date, end_inclusive = parse_end_bound(end_date)
         if not start_date:
             start_date = end_date - get_timedelta_from_timeframe('1D')
         else:
-            start_date = timezone.make_aware(timezone.datetime.fromisoformat(start_date))
+            # Acepta fechas con o sin offset, igual que /export/; lanza ValueError si el formato es inválido
+            start_date = parse_iso_datetime(start_date)
 
-        filtered_qs = self.queryset.filter(timestamp__gte=start_date, timestamp__lte=end_date)
+        filtered_qs = self.queryset.filter(end_bound_q(end_date, end_inclusive), timestamp__gte=start_date)
 
-        values_fields = ['timestamp', 'sensor', 'metric', 'value']
-        latest_datapoints = filtered_qs.order_by('sensor', '-timestamp').distinct('sensor').values(*values_fields)
+        if connections[filtered_qs.db].vendor == 'postgresql':
+            latest_qs = filtered_qs.order_by('sensor', '-timestamp').distinct('sensor')
+        else:
+            # Sin DISTINCT ON (p. ej. SQLite en desarrollo): ROW_NUMBER() por sensor, también en una sola consulta
+            latest_qs = filtered_qs.annotate(
+                row_number=Window(RowNumber(), partition_by=[F('sensor')], order_by=F('timestamp').desc())
+            ).filter(row_number=1).order_by('sensor')
 
-        if self.include_room:
-            sensor_names = set(item['sensor'] for item in latest_datapoints)
-            self.sensor_room_map = self._get_sensor_room_map_filtered(sensor_names)
-            for item in latest_datapoints:
-                item['room'] = self.sensor_room_map.get(item['sensor'], '')
+        # Tuplas en lugar de dicts: una única pasada arma la respuesta (una fila por sensor)
+        latest_datapoints = list(latest_qs.values_list(*self.get_values_list()))
 
+        # Mismo formato de timestamp (hora local con offset) que el listado y /export/
         if self.include_room:
+            sensor_names = set(sensor for _, sensor, _, _ in latest_datapoints)
+            self.sensor_room_map = self._get_sensor_room_map_filtered(sensor_names)
             return [
                 {
-                    'timestamp': item['timestamp'].isoformat() if hasattr(item['timestamp'], 'isoformat') else str(item['timestamp']),
-                    'room': item['room'],
-                    'sensor': item['sensor'],
-                    'metric': item['metric'],
-                    'value': item['value']
-                }
-                for item in latest_datapoints
-            ]
-        else:
-            return [
-                {
-                    'timestamp': item['timestamp'].isoformat() if hasattr(item['timestamp'], 'isoformat') else str(item['timestamp']),
-                    'sensor': item['sensor'],
-                    'metric': item['metric'],
-                    'value': item['value']
+                    'timestamp': timezone.localtime(ts).isoformat(),
+                    'room': self.sensor_room_map.get(sensor, ''),
+                    'sensor': sensor,
+                    'metric': metric,
+                    'value': value
                 }
-                for item in latest_datapoints
+                for ts, sensor, metric, value in latest_datapoints
             ]
+        return [
+            {'timestamp': timezone.localtime(ts).isoformat(), 'sensor': sensor, 'metric': metric, 'value': value}
+            for ts, sensor, metric, value in latest_datapoints
+        ]
 
 
 class TimeframedData(DataPointQueryProcessor):
@@ -372,15 +537,19 @@ class TimeframedData(DataPointQueryProcessor):
         end_date = timezone.now()
         start_date = get_start_date(self.timeframe, end_date)
         queryset_timeframed = self.queryset.filter(timestamp__gte=start_date, timestamp__lte=end_date)
+        if connections[queryset_timeframed.db].vendor == 'postgresql':
+            return self._aggregate_in_db(queryset_timeframed)
         values_list = self.get_values_list()
-        data_values = list(queryset_timeframed.values(*values_list))
-        if not data_values:
+        data_rows = list(queryset_timeframed.values_list(*values_list))
+        if not data_rows:
             return []
+        # Columnas directas desde las tuplas: evita un dict por fila y la inferencia de pd.DataFrame(list_of_dicts)
+        df = pd.DataFrame(dict(zip(values_list, zip(*data_rows))))
+        # Los DateTimeField aware ya llegan como datetime64[ns, tz]; convertir solo si no lo son
+        if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
         if self.include_room:
-            unique_sensors = set(item['sensor'] for item in data_values)
-            self.sensor_room_map = self._get_sensor_room_map_filtered(unique_sensors)
-        df = pd.DataFrame(data_values)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+            self.sensor_room_map = self._get_sensor_room_map_filtered(set(df['sensor'].unique()))
         if self.include_room:
             df['room'] = df['sensor'].map(self.sensor_room_map)
             df['room'] = df['room'].fillna('')
@@ -390,7 +559,63 @@ class TimeframedData(DataPointQueryProcessor):
             results = self._process_with_aggregations(df, group_cols)
         else:
             results = self._process_without_aggregations(df, group_cols)
-        return DataPointRoomSerializer(results, many=True).data if self.include_room else DataPointSerializer(results, many=True).data
+        # Los registros ya tienen el esquema final (timestamp ISO, sensor/room, metric, value): se entregan sin pasar por un ModelSerializer
+        return results
+
+    def _room_expression(self):
+        """CASE sensor -> room con el mapeo cacheado; sensores sin sala quedan en '' como en el camino con pandas."""
+        sensors_by_room = {}
+        for sensor, room in self.sensor_room_map.items():
+            if room:
+                sensors_by_room.setdefault(room, []).append(sensor)
+        return Case(
+            *[When(sensor__in=sensors, then=Value(room)) for room, sensors in sensors_by_room.items()],
+            default=Value(''),
+            output_field=CharField()
+        )
+
+    def _aggregate_in_db(self, queryset):
+        """Agrega en PostgreSQL con GROUP BY (sensor o room, métrica, bucket de date_bin): sale de la base una fila por grupo."""
+        if self.include_room:
+            self.sensor_room_map = self._get_sensor_room_map()
+            key_col, key_expression = 'room', self._room_expression()
+        else:
+            key_col, key_expression = 'sensor', F('sensor')
+
+        agg_funcs = ['mean', 'min', 'max', 'first', 'last'] if self.aggregations else ['mean']
+        aggregates = {
+            'mean': Avg('value'),
+            'min': Min('value'),
+            'max': Max('value'),
+            'first': FirstByTimestamp('value'),
+            'last': LastByTimestamp('value'),
+        }
+        rows = list(
+            queryset.annotate(
+                group_key=key_expression,
+                bucket=DateBin(TIMEFRAME_BIN_INTERVALS[self.timeframe], 'timestamp')
+            ).values('group_key', 'metric', 'bucket').annotate(
+                **{agg_func: aggregates[agg_func] for agg_func in agg_funcs}
+            ).order_by().values_list('group_key', 'metric', 'bucket', *agg_funcs)
+        )
+        if not rows:
+            return []
+
+        # Mismo orden que el groupby de pandas (clave, métrica, bucket) sin depender de la collation de la base
+        rows.sort(key=itemgetter(0, 1, 2))
+        keys, metrics, buckets, *agg_columns = zip(*rows)
+        timestamps = [bucket.isoformat() for bucket in buckets]
+        rounded_columns = [np.round(np.array(column, dtype='float64'), 2).tolist() for column in agg_columns]
+
+        if self.aggregations:
+            return [
+                {'timestamp': ts, key_col: key, 'metric': metric, 'value': dict(zip(agg_funcs, row_values))}
+                for ts, key, metric, row_values in zip(timestamps, keys, metrics, zip(*rounded_columns))
+            ]
+        return [
+            {'timestamp': ts, key_col: key, 'metric': metric, 'value': value}
+            for ts, key, metric, value in zip(timestamps, keys, metrics, rounded_columns[0])
+        ]
 
     def _process_with_aggregations(self, df, group_cols):
         """Procesa DataFrame aplicando múltiples agregaciones (media, min, max, first, last)."""
@@ -403,29 +628,14 @@ class TimeframedData(DataPointQueryProcessor):
         grouped = df_reduced.groupby([*group_cols, pd.Grouper(freq=TIMEFRAME_MAP[self.timeframe])])['value'].agg(agg_funcs).reset_index()
         grouped = grouped.rename(columns={'timestamp': 'timeframed_timestamp'})
         
-        results = []
-        for _, row in grouped.iterrows():
-            result_dict = {
-                'timestamp': row['timeframed_timestamp'].isoformat(),
-            }
-            
-            if 'room' in group_cols:
-                result_dict['room'] = row['room']
-            else:
-                result_dict['sensor'] = row['sensor']
-                
-            result_dict['metric'] = row['metric']
-            result_dict['value'] = {
-                'mean': round(row['mean'], 2),
-                'min': round(row['min'], 2),
-                'max': round(row['max'], 2),
-                'first': round(row['first'], 2),
-                'last': round(row['last'], 2)
-            }
-            
-            results.append(result_dict)
-        
-        return results
+        # Redondeo vectorizado y armado por columnas: evita construir una Series por fila con iterrows
+        key_col = 'room' if 'room' in group_cols else 'sensor'
+        timestamps = [ts.isoformat() for ts in grouped['timeframed_timestamp']]
+        values = grouped[agg_funcs].round(2).itertuples(index=False, name=None)
+        return [
+            {'timestamp': ts, key_col: key, 'metric': metric, 'value': dict(zip(agg_funcs, row_values))}
+            for ts, key, metric, row_values in zip(timestamps, grouped[key_col], grouped['metric'], values)
+        ]
     def _process_without_aggregations(self, df, group_cols):
         """Procesa DataFrame aplicando solo la media como agregación."""
         if df.empty:
@@ -436,20 +646,9 @@ class TimeframedData(DataPointQueryProcessor):
         grouped = df_reduced.groupby([*group_cols, pd.Grouper(freq=TIMEFRAME_MAP[self.timeframe])])['value'].mean().reset_index()
         grouped = grouped.rename(columns={'timestamp': 'timeframed_timestamp', 'value': 'mean_value'})
         
-        results = []
-        for _, row in grouped.iterrows():
-            result_dict = {
-                'timestamp': row['timeframed_timestamp'].isoformat(),
-            }
-            
-            if 'room' in group_cols:
-                result_dict['room'] = row['room']
-            else:
-                result_dict['sensor'] = row['sensor']
-                
-            result_dict['metric'] = row['metric']
-            result_dict['value'] = round(row['mean_value'], 2)
-            
-            results.append(result_dict)
-        
-        return results
+        key_col = 'room' if 'room' in group_cols else 'sensor'
+        timestamps = [ts.isoformat() for ts in grouped['timeframed_timestamp']]
+        return [
+            {'timestamp': ts, key_col: key, 'metric': metric, 'value': value}
+            for ts, key, metric, value in zip(timestamps, grouped[key_col], grouped['metric'], grouped['mean_value'].round(2))
+        ]
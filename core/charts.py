@@ -1,19 +1,179 @@
+import hashlib
 import plotly.graph_objects as go
 import plotly.io as pio
 from pathlib import Path
 from loguru import logger
 import numpy as np
 import pandas as pd
-from plotly.offline import plot
 import plotly.colors as pcolors
 from plotly.subplots import make_subplots
+from django.core.cache import cache
 from django.utils import timezone
-from .utils import calculate_vpd, METRICS_CFG, INTERACTIVE_CHART_METRIC_NAMES, INTERACTIVE_CHART_BAND_CFG
+from .utils import calculate_vpd, lttb_downsample, METRICS_CFG, INTERACTIVE_CHART_METRIC_NAMES, INTERACTIVE_CHART_BAND_CFG
 
 # Get project root directory
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Tope de puntos por traza: por encima se reduce con LTTB antes de serializar a Plotly
+MAX_POINTS_PER_TRACE = 2000
+
+# Partes fijas del layout de sensor_plot. La figura se arma como dict y se serializa con validate=False
+# (sin los validadores de go.Figure/go.Scatter); el template por defecto se incluye explícitamente,
+# ya que go.Figure lo agrega solo
+SENSOR_PLOT_LAYOUT = {
+    'template': pio.templates[pio.templates.default].to_plotly_json(),
+    'paper_bgcolor': 'white',
+    'plot_bgcolor': 'white',
+    'showlegend': False,
+    'autosize': True,
+    'margin': {'l': 50, 'r': 60, 't': 40, 'b': 25},
+    'title': {
+        'y': 0.95,
+        'x': 0.5,
+        'xanchor': 'center',
+        'yanchor': 'top',
+        'font': {"size": 14, "color": "#5f9b62", "family": "Raleway, HelveticaNeue, Helvetica Neue, Helvetica, Arial, sans-serif"}
+    },
+    'xaxis': {
+        'type': 'date',
+        'fixedrange': True,
+        'tickmode': 'auto',
+        'showgrid': True, 'gridcolor': 'lightgrey', 'gridwidth': 0.5, 'griddash': 'dot',
+        'visible': True
+    },
+    'yaxis': {
+        'fixedrange': True,
+        'tickmode': 'auto',
+        'showgrid': True, 'gridcolor': 'lightgrey', 'gridwidth': 0.5, 'griddash': 'dot',
+        'visible': True,
+        'side': 'right'
+    },
+    'hovermode': 'x unified',
+    'annotations': [
+        {
+            "x": -0.04, "y": 0.5, "xref": "paper", "yref": "paper",
+            "showarrow": False, "textangle": -90,
+            "xanchor": "left", "yanchor": "middle",
+            "font": {"size": 14, "color": "#5f9b62", "family": "Raleway, HelveticaNeue, Helvetica Neue, Helvetica, Arial, sans-serif"}
+        }
+    ]
+}
+
+# Partes fijas del layout y de los ejes de interactive_chart
+INTERACTIVE_CHART_LAYOUT = {
+    'plot_bgcolor': 'white',
+    'paper_bgcolor': 'white',
+    'margin': {'l': 35, 'r': 35, 't': 35, 'b': 35},
+    'hovermode': 'closest',
+    'legend': {'orientation': 'h', 'yanchor': 'top', 'y': -0.1, 'xanchor': 'center', 'x': 0.5, 'traceorder': 'normal'},
+    'autosize': True
+}
+
+INTERACTIVE_CHART_XAXIS = {
+    'type': 'date',
+    'showticklabels': True,
+    'showgrid': True, 'gridwidth': 1, 'gridcolor': 'rgba(211,211,211,0.5)',
+    'showline': True, 'linewidth': 1, 'linecolor': 'lightgreen', 'mirror': True,
+    'tickfont': {}
+}
+
+INTERACTIVE_CHART_YAXIS = {
+    'showgrid': True, 'gridwidth': 1, 'gridcolor': 'rgba(211,211,211,0.5)',
+    'showline': True, 'linewidth': 1, 'linecolor': 'lightgreen', 'mirror': True,
+    'tickfont': {},
+    'tickformat': '.1f',
+    'ticks': 'outside',
+    'showticklabels': True
+}
+
+# Partes fijas del layout de gauge_plot
+GAUGE_PLOT_LAYOUT = {
+    'autosize': True,
+    'margin': {'l': 35, 'r': 35, 't': 70, 'b': 10},
+    'paper_bgcolor': 'white',
+    'font': {'color': "#666666", 'family': "Raleway, HelveticaNeue, Helvetica Neue, Helvetica, Arial, sans-serif"},
+    'showlegend': False,
+    'title': {
+        'y': 0.90,
+        'x': 0.5,
+        'xanchor': 'center',
+        'yanchor': 'top',
+        'font': {'size': 16, 'color': '#5f9b62', 'family': 'Raleway, HelveticaNeue, Helvetica Neue, Helvetica, Arial, sans-serif'}
+    }
+}
+
+# Bandas objetivo de VPD: (nombre, vpd mínimo, vpd máximo, color)
+VPD_BANDS = (
+    ("Muy Húmedo", 0, 0.4, "rgba(245, 230, 255, 0.2)"),
+    ("Propagación", 0.4, 0.8, "rgba(195, 230, 215, 0.5)"),
+    ("Vegetación", 0.8, 1.2, "rgba(255, 225, 180, 0.5)"),
+    ("Flora", 1.2, 1.6, "rgba(255, 200, 150, 0.5)"),
+    ("Muy Seco", 1.6, 10.0, "rgba(255, 100, 100, 0.025)")
+)
+
+# Partes fijas del layout y de los ejes de vpd_plot; los rangos dependen de los argumentos
+VPD_PLOT_LAYOUT = {
+    'legend': {'orientation': 'h', 'yanchor': 'bottom', 'y': 1.05, 'xanchor': 'center', 'x': 0.5},
+    'plot_bgcolor': 'white',
+    'margin': {'l': 10, 'r': 10, 't': 35, 'b': 10},
+    'autosize': True
+}
+
+VPD_PLOT_XAXIS = {
+    'title': 'Humedad Relativa (%HR)', 'dtick': 10,
+    'gridcolor': 'rgba(200, 200, 200, 0.2)', 'side': 'bottom', 'tickfont': {'size': 10}
+}
+
+VPD_PLOT_YAXIS = {
+    'title': 'Temperatura (°C)', 'dtick': 5,
+    'gridcolor': 'rgba(200, 200, 200, 0.2)', 'side': 'right', 'tickfont': {'size': 10}
+}
+
+# Tamaño de la imagen estática de sensor_plot_image (sin navegador no hay contenedor del cual tomar el ancho)
+SENSOR_IMAGE_SIZE = {'width': 1200, 'height': 400}
+
+# Tope en segundos para reutilizar un gráfico cacheado (gauges y las cachés de las vistas en core/views.py)
+CHART_CACHE_TIMEOUT = 60
+
+def _epoch_ms(timestamps):
+    """Convierte timestamps a ms epoch de su hora local de pared (lo que Plotly muestra), sin formatear un string por punto."""
+    return pd.DatetimeIndex(timestamps).tz_localize(None).as_unit('ms').asi8.tolist()
+
+def _sensor_band_layout(metric_cfg):
+    """Franjas de color (shapes) y rango del eje y de sensor_plot según los steps de la métrica."""
+    steps = metric_cfg["steps"]
+    colors = metric_cfg["color_bars_gradient"]
+    shapes = []
+    if steps[0] != 0:
+        shapes.append({
+            "type": "rect", "xref": "paper", "yref": "y",
+            "x0": 0, "x1": 1, "y0": 0, "y1": steps[0],
+            "fillcolor": colors[0] if len(colors) > 0 else 'rgba(200,200,200,0.2)',
+            "opacity": 0.07, "line": {"width": 0},
+        })
+    for i in range(1, len(steps)):
+        fillcolor = colors[i] if i < len(colors) else 'rgba(200,200,200,0.2)'
+        shapes.append({
+            "type": "rect", "xref": "paper", "yref": "y",
+            "x0": 0, "x1": 1, "y0": steps[i-1], "y1": steps[i],
+            "fillcolor": fillcolor, "opacity": 0.07, "line": {"width": 0},
+        })
+
+    min_y = (0 + steps[0]) / 2
+    max_y = steps[-1] * 1.05 if len(steps) > 1 else steps[0] * 1.5
+    return shapes, [min_y, max_y]
+
+# METRICS_CFG es fijo: las franjas y el rango de cada métrica se calculan una sola vez al importar
+SENSOR_PLOT_BANDS = {metric: _sensor_band_layout(cfg) for metric, cfg in METRICS_CFG.items() if "steps" in cfg}
+
 def gauge_plot(value, metric, sensor, timestamp=None):
+    """Retorna HTML del medidor, cacheado por sus parámetros: la misma lectura produce el mismo gráfico."""
+    digest = hashlib.blake2b(repr((value, metric, str(sensor), timestamp)).encode(), digest_size=16).hexdigest()
+    return cache.get_or_set(
+        f"chart:gauge:{digest}", lambda: _build_gauge_plot(value, metric, sensor, timestamp), CHART_CACHE_TIMEOUT
+    )
+
+def _build_gauge_plot(value, metric, sensor, timestamp=None):
     """Genera HTML de gráfico de medidor para una métrica de sensor."""
     metric_cfg = METRICS_CFG.get(metric)
     if not metric_cfg:
@@ -75,24 +235,8 @@ def gauge_plot(value, metric, sensor, timestamp=None):
         timestamp_str = ""
 
     fig.update_layout(
-        autosize=True,
-        margin=dict(l=35, r=35, t=70, b=10),
-        paper_bgcolor="white",
-        font={'color': "#666666",
-                 'family': "Raleway, HelveticaNeue, Helvetica Neue, Helvetica, Arial, sans-serif"},
-        showlegend=False,
-        title={
-            'text': f"<b>{main_title}</b><br><span style='font-size:0.8em;'>{sensor_name}</span>",
-            'y': 0.90,
-            'x': 0.5,
-            'xanchor': 'center',
-            'yanchor': 'top',
-            'font': {
-                'size': 16,
-                'color': '#5f9b62',
-                'family': 'Raleway, HelveticaNeue, Helvetica Neue, Helvetica, Arial, sans-serif'
-            }
-        },
+        GAUGE_PLOT_LAYOUT,
+        title_text=f"<b>{main_title}</b><br><span style='font-size:0.8em;'>{sensor_name}</span>",
         annotations=[
             dict(
                 x=1,
@@ -121,111 +265,85 @@ def sensor_plot(df, sensor, metric, timeframe, start_date, end_date):
             logger.warning(f"sensor_plot: DataFrame vacío para {sensor} - {metric}. No se generará gráfico.")
             return f'<div>No hay datos para graficar para {sensor} - {metric}</div>', 0
         
-        df = df.dropna(subset=['value'])
-        if df.empty: 
-            logger.warning(f"sensor_plot: No hay datos válidos para {sensor} - {metric} después de dropna. No se generará gráfico.")
+        fig, points = _sensor_figure(df, sensor, metric, start_date, end_date)
+        if fig is None:
             return f'<div>No hay datos válidos para graficar para {sensor} - {metric}</div>', 0
-            
-        processed_values = df['value'].tolist()
-        processed_timestamps = df['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S').tolist()
-            
-        metric_cfg = METRICS_CFG.get(metric, {'brand_color': '#808080', 'title': metric.title()})
-        
-        fig = go.Figure()
-        
-        if "steps" in metric_cfg:
-            steps = metric_cfg["steps"]
-            colors = metric_cfg["color_bars_gradient"]
-            shapes = []
-            if steps[0] != 0:
-                shapes.append({
-                    "type": "rect", "xref": "paper", "yref": "y",
-                    "x0": 0, "x1": 1, "y0": 0, "y1": steps[0],
-                    "fillcolor": colors[0] if len(colors) > 0 else 'rgba(200,200,200,0.2)',
-                    "opacity": 0.07, "line": {"width": 0},
-                })
-            for i in range(1, len(steps)):
-                fillcolor = colors[i] if i < len(colors) else 'rgba(200,200,200,0.2)'
-                shapes.append({
-                    "type": "rect", "xref": "paper", "yref": "y",
-                    "x0": 0, "x1": 1, "y0": steps[i-1], "y1": steps[i],
-                    "fillcolor": fillcolor, "opacity": 0.07, "line": {"width": 0},
-                })
-            
-            min_y = (0 + steps[0]) / 2 
-            max_y = steps[-1] * 1.05 if len(steps) > 1 else steps[0] * 1.5
-            y_range = [min_y, max_y]
-        else:
-            shapes = []
-            y_range = None
-        
-        fig.add_trace(
-            go.Scatter(
-                x=processed_timestamps,
-                y=processed_values,
-                mode='lines',
-                name=metric_cfg['title'],
-                line=dict(color=metric_cfg['brand_color']),
-                hovertemplate='%{y:.1f}'
-            )
-        )
-        
-        fig.update_layout(
-            paper_bgcolor='white',
-            plot_bgcolor='white',
-            shapes=shapes,
-            showlegend=False,
-            height=None, 
-            width=None, 
-            autosize=True,
-            margin=dict(l=50, r=60, t=40, b=25),
-            title={
-                'text': f"<b>{metric_cfg['title']}</b>",
-                'y': 0.95,
-                'x': 0.5,
-                'xanchor': 'center',
-                'yanchor': 'top',
-                'font': {"size": 14, "color": "#5f9b62", "family": "Raleway, HelveticaNeue, Helvetica Neue, Helvetica, Arial, sans-serif"}
-            },
-            xaxis={
-                'type': 'date',
-                'fixedrange': True,
-                'tickmode': 'auto',
-                'showgrid': True, 'gridcolor': 'lightgrey', 'gridwidth': 0.5, 'griddash': 'dot',
-                'visible': True,
-                'range': [start_date.isoformat(), end_date.isoformat()] 
-            },
-            yaxis={
-                'fixedrange': True,
-                'range': y_range,
-                'tickmode': 'auto',
-                'showgrid': True, 'gridcolor': 'lightgrey', 'gridwidth': 0.5, 'griddash': 'dot',
-                'visible': True,
-                'side': 'right' 
-            },
-            hovermode='x unified',
-            annotations=[
-                {
-                    "x": -0.04, "y": 0.5, "xref": "paper", "yref": "paper",
-                    "text": f"<span style='font-size:0.8em;'>{sensor.upper()}</span>",
-                    "showarrow": False, "textangle": -90,
-                    "xanchor": "left", "yanchor": "middle",
-                    "font": {"size": 14, "color": "#5f9b62", "family": "Raleway, HelveticaNeue, Helvetica Neue, Helvetica, Arial, sans-serif"}
-                }
-            ]
-        )
         
         return pio.to_html(
             fig,
+            validate=False,
             include_plotlyjs=False,
             full_html=False,
             config={'responsive': True, 'displayModeBar': False}
-        ), len(processed_values)
+        ), points
         
     except Exception as e:
         logger.error(f"Error en lineplot_generator: {str(e)}")
         return f'<div>Error generando el gráfico: {str(e)}</div>', 0
 
+def sensor_plot_json(df, sensor, metric, timeframe, start_date, end_date):
+    """Retorna (json de la figura para Plotly.react, puntos) de sensor_plot; json es None si no hay datos válidos."""
+    try:
+        fig, points = _sensor_figure(df, sensor, metric, start_date, end_date)
+        if fig is None:
+            return None, 0
+        return pio.to_json(fig, validate=False, pretty=False), points
+    except Exception as e:
+        logger.error(f"sensor_plot_json: Error generando la figura para {sensor} - {metric}: {str(e)}")
+        return None, 0
+
+def sensor_plot_image(df, sensor, metric, timeframe, start_date, end_date, image_format='png'):
+    """Retorna (bytes de la imagen estática renderizada con Kaleido, puntos) de sensor_plot; bytes es None si no hay datos o falla el render."""
+    try:
+        fig, points = _sensor_figure(df, sensor, metric, start_date, end_date)
+        if fig is None:
+            return None, 0
+        return pio.to_image(fig, format=image_format, validate=False, **SENSOR_IMAGE_SIZE), points
+    except Exception as e:
+        logger.error(f"sensor_plot_image: Error renderizando la imagen para {sensor} - {metric}: {str(e)}")
+        return None, 0
+
+def _sensor_figure(df, sensor, metric, start_date, end_date):
+    """Construye la figura de línea del sensor como dict; retorna (fig, puntos) o (None, 0) si no quedan datos válidos."""
+    df = df.dropna(subset=['value'])
+    if df.empty:
+        logger.warning(f"sensor_plot: No hay datos válidos para {sensor} - {metric} después de dropna. No se generará gráfico.")
+        return None, 0
+        
+    df = lttb_downsample(df, 'timestamp', 'value', MAX_POINTS_PER_TRACE)
+    # 2 decimales bastan para lecturas de sensor y acortan el JSON emitido (el hover muestra .1f)
+    processed_values = df['value'].round(2).tolist()
+    processed_timestamps = _epoch_ms(df['timestamp'])
+        
+    metric_cfg = METRICS_CFG.get(metric, {'brand_color': '#808080', 'title': metric.title()})
+    
+    shapes, y_range = SENSOR_PLOT_BANDS.get(metric, ([], None))
+    yaxis = SENSOR_PLOT_LAYOUT['yaxis'] if y_range is None else {**SENSOR_PLOT_LAYOUT['yaxis'], 'range': y_range}
+    
+    trace = {
+        'type': 'scatter',
+        'x': processed_timestamps,
+        'y': processed_values,
+        'mode': 'lines',
+        'name': metric_cfg['title'],
+        'line': {'color': metric_cfg['brand_color']},
+        'hovertemplate': '%{y:.1f}'
+    }
+    
+    layout = {
+        **SENSOR_PLOT_LAYOUT,
+        'title': {**SENSOR_PLOT_LAYOUT['title'], 'text': f"<b>{metric_cfg['title']}</b>"},
+        'xaxis': {**SENSOR_PLOT_LAYOUT['xaxis'], 'range': [start_date.isoformat(), end_date.isoformat()]},
+        'yaxis': yaxis,
+        'annotations': [
+            {**SENSOR_PLOT_LAYOUT['annotations'][0], "text": f"<span style='font-size:0.8em;'>{sensor.upper()}</span>"}
+        ]
+    }
+    if shapes:
+        layout['shapes'] = shapes
+    
+    return {'data': [trace], 'layout': layout}, len(processed_values)
+
 def vpd_plot(data, temp_min=10, temp_max=40, hum_min=20, hum_max=80):
     """Genera HTML de gráfico VPD, mostrando puntos de salas contra bandas objetivo de VPD."""
     filtered_data = [
@@ -237,29 +355,24 @@ def vpd_plot(data, temp_min=10, temp_max=40, hum_min=20, hum_max=80):
     if not filtered_data:
         return '<div>Sin datos en el rango especificado</div>'
 
-    vpd_bands = [
-        ("Muy Húmedo", 0, 0.4, "rgba(245, 230, 255, 0.2)"),
-        ("Propagación", 0.4, 0.8, "rgba(195, 230, 215, 0.5)"),
-        ("Vegetación", 0.8, 1.2, "rgba(255, 225, 180, 0.5)"),
-        ("Flora", 1.2, 1.6, "rgba(255, 200, 150, 0.5)"),
-        ("Muy Seco", 1.6, 10.0, "rgba(255, 100, 100, 0.025)")
-    ]
     temperatures = np.linspace(temp_min, temp_max, 200)
+    # SVP (Tetens) se calcula una sola vez para todas las temperaturas y se reutiliza en cada borde de banda
+    svp = 0.6108 * np.exp((17.27 * temperatures) / (temperatures + 237.3))
 
-    def calc_hum_from_vpd(t, vpd):
-        svp = 0.6108 * np.exp((17.27 * t) / (t + 237.3))
-        h = 100 * (1 - vpd / svp) if svp > 0 else 100
-        return max(hum_min, min(hum_max, h))
+    def calc_hum_from_vpd(vpd):
+        h = np.where(svp > 0, 100 * (1 - vpd / svp), 100)
+        return np.clip(h, hum_min, hum_max).tolist()
 
-    fig = go.Figure()
-    for band_name, vpd_min_band, vpd_max_band, color in vpd_bands:
-        h_upper = [calc_hum_from_vpd(t, vpd_min_band) for t in temperatures]
-        h_lower = [calc_hum_from_vpd(t, vpd_max_band) for t in temperatures]
-        fig.add_trace(go.Scatter(
+    # Bandas y puntos de sala se arman como lista y se agregan a la figura en una sola llamada
+    traces = []
+    for band_name, vpd_min_band, vpd_max_band, color in VPD_BANDS:
+        h_upper = calc_hum_from_vpd(vpd_min_band)
+        h_lower = calc_hum_from_vpd(vpd_max_band)
+        traces.append(go.Scatter(
             x=h_upper, y=temperatures, mode='lines', line=dict(width=0),
             fillcolor=color, showlegend=False
         ))
-        fig.add_trace(go.Scatter(
+        traces.append(go.Scatter(
             x=h_lower, y=temperatures, mode='lines', line=dict(width=0),
             fill='tonexty', fillcolor=color, name=band_name,
             showlegend=not band_name.startswith("Muy")
@@ -267,7 +380,7 @@ def vpd_plot(data, temp_min=10, temp_max=40, hum_min=20, hum_max=80):
 
     for room_name, temp, hum in filtered_data:
         current_vpd = calculate_vpd(temp, hum)
-        fig.add_trace(go.Scatter(
+        traces.append(go.Scatter(
             y=[temp], x=[hum], mode='markers+text',
             marker=dict(size=10, color='black'),
             text=[f"Sala {room_name} {current_vpd:.1f} kPa"],
@@ -281,20 +394,13 @@ def vpd_plot(data, temp_min=10, temp_max=40, hum_min=20, hum_max=80):
             showlegend=False
         ))
 
+    fig = go.Figure(data=traces)
     fig.update_layout(
-        legend=dict(orientation='h', yanchor='bottom', y=1.05, xanchor='center', x=0.5),
-        xaxis=dict(
-            title='Humedad Relativa (%HR)', range=[hum_min, hum_max], dtick=10,
-            gridcolor='rgba(200, 200, 200, 0.2)', side='bottom', tickfont=dict(size=10)
-        ),
-        yaxis=dict(
-            title='Temperatura (°C)', range=[temp_min, temp_max], dtick=5,
-            gridcolor='rgba(200, 200, 200, 0.2)', side='right', tickfont=dict(size=10)
-        ),
-        plot_bgcolor='white', margin=dict(l=10, r=10, t=35, b=10),
-        autosize=True
+        VPD_PLOT_LAYOUT,
+        xaxis={**VPD_PLOT_XAXIS, 'range': [hum_min, hum_max]},
+        yaxis={**VPD_PLOT_YAXIS, 'range': [temp_min, temp_max]}
     )
-    return fig.to_html(include_plotlyjs='cdn', full_html=False, config={'responsive': True, 'displayModeBar': False})
+    return fig.to_html(include_plotlyjs=False, full_html=False, config={'responsive': True, 'displayModeBar': False})
 
 def interactive_chart(data_df, metrics, by_room=False, timeframe='4h', start_date=None, end_date=None):
     if data_df.empty:
@@ -317,11 +423,17 @@ def interactive_chart(data_df, metrics, by_room=False, timeframe='4h', start_dat
         return "<div class='no-data-alert'>Error: Columna de agrupación requerida ausente.</div>", 0
     
     plotted_points = 0
-    unique_items = sorted(data_df[group_column].unique())
+    # Particionar una sola vez (ya ordenado por timestamp) y reutilizar los grupos para cada métrica;
+    # groupby entrega las claves ordenadas, así que de aquí salen también los ítems y sus colores
+    groups_by_item = list(data_df.sort_values(by='timestamp').groupby(group_column, observed=True))
+    unique_items = [item_name for item_name, _ in groups_by_item]
     color_map = {item_name: base_colors[i % len(base_colors)] for i, item_name in enumerate(unique_items)}
 
-    logger.debug(f"interactive_chart: Plotting for {len(unique_items)} unique {group_column}s: {unique_items}")
+    logger.opt(lazy=True).debug("interactive_chart: Plotting for {} unique {}s: {}", lambda: len(unique_items), group_column, lambda: unique_items)
     
+    # Las trazas se acumulan con su fila de subplot y se agregan juntas con add_traces
+    traces = []
+    trace_rows = []
     for i, metric_code in enumerate(metrics, 1):
         if metric_code in INTERACTIVE_CHART_BAND_CFG:
             steps = INTERACTIVE_CHART_BAND_CFG[metric_code]['steps']
@@ -353,70 +465,40 @@ def interactive_chart(data_df, metrics, by_room=False, timeframe='4h', start_dat
             logger.warning(f"interactive_chart: Metric '{metric_code}' not in DataFrame columns: {data_df.columns.tolist()}")
             continue
             
-        for item_name, group_data in data_df.groupby(group_column):
+        for item_name, group_data in groups_by_item:
             valid_data = group_data.dropna(subset=[metric_code])
             if valid_data.empty:
                 continue
                 
-            valid_data = valid_data.sort_values(by='timestamp')
+            valid_data = lttb_downsample(valid_data, 'timestamp', metric_code, MAX_POINTS_PER_TRACE)
             plotted_points += len(valid_data)
             item_color = color_map.get(item_name, '#808080') 
             current_metric_name = INTERACTIVE_CHART_METRIC_NAMES.get(metric_code, metric_code.upper())
             
-            fig.add_trace(
+            traces.append(
                 go.Scatter(
-                    x=valid_data['timestamp'],
-                    y=valid_data[metric_code],
+                    x=_epoch_ms(valid_data['timestamp']),
+                    y=valid_data[metric_code].round(2),
                     mode='lines+markers',
                     name=f"{item_name} - {current_metric_name}",
                     line=dict(color=item_color, width=1.5),
                     marker=dict(size=3, color=item_color),
                     hovertemplate=f"{item_name} ({current_metric_name}): %{{y:.1f}}<extra></extra>"
-                ),
-                row=i, col=1
+                )
             )
+            trace_rows.append(i)
+    
+    if traces:
+        fig.add_traces(traces, rows=trace_rows, cols=[1] * len(traces))
     
     if plotted_points == 0:
         logger.warning("interactive_chart: No points plotted. DataFrame might be empty or all items filtered.")
         return "<div class='no-data-alert'>No hay datos para mostrar después del filtrado.</div>", 0
     
-    # Determine layout properties based on number of metrics
-    final_height = 467 * len(metrics)  # Default for multi-metric
-    bottom_xaxis_title_text = None
-    bottom_xaxis_title_font = None
-
-    fig.update_layout(
-        height=final_height,
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        margin=dict(l=35, r=35, t=35, b=35),
-        hovermode='closest',
-        legend=dict(
-            orientation="h",
-            yanchor="top",
-            y=-0.1, 
-            xanchor="center",
-            x=0.5,
-            traceorder="normal"
-        ),
-        autosize=True
-    )
-    
-    for i_ax in range(1, len(metrics) + 1):
-        fig.update_xaxes(
-            range=[start_date, end_date],
-            showticklabels=True, 
-            showgrid=True, gridwidth=1, gridcolor='rgba(211,211,211,0.5)', 
-            showline=True, linewidth=1, linecolor='lightgreen', mirror=True,
-            row=i_ax, col=1,
-            tickfont=dict()
-        )
-        
-    fig.update_xaxes(
-        title_text=bottom_xaxis_title_text,
-        title_font=bottom_xaxis_title_font,
-        row=len(metrics), col=1 
-    )
+    # Alto según la cantidad de métricas; estilos fijos desde constantes de módulo, aplicados a todos los ejes en una llamada
+    fig.update_layout(INTERACTIVE_CHART_LAYOUT, height=467 * len(metrics))
+    fig.update_xaxes(INTERACTIVE_CHART_XAXIS, range=[start_date, end_date])
+    fig.update_yaxes(INTERACTIVE_CHART_YAXIS)
     
     for i_ax in range(1, len(metrics) + 1):
         metric_code = metrics[i_ax-1]
@@ -433,25 +515,9 @@ def interactive_chart(data_df, metrics, by_room=False, timeframe='4h', start_dat
             font={"size": 14, "color": "#5f9b62", "family": "Raleway, HelveticaNeue, Helvetica Neue, Helvetica, Arial, sans-serif"},
             xanchor='center', yanchor='bottom'
         )
-        
-        fig.update_yaxes(
-            showgrid=True, 
-            gridwidth=1, 
-            gridcolor='rgba(211,211,211,0.5)', 
-            showline=True, 
-            linewidth=1, 
-            linecolor='lightgreen', 
-            mirror=True,
-            tickfont=dict(),
-            tickformat=".1f",
-            ticks="outside",
-            showticklabels=True,
-            row=i_ax, 
-            col=1
-        )
     
     logger.debug(f"interactive_chart: Generated chart with {plotted_points} points")
-    return fig.to_html(include_plotlyjs='cdn', full_html=False, config={
+    return fig.to_html(include_plotlyjs=False, full_html=False, config={
         'responsive': True,
         'displayModeBar': False,
         'displaylogo': False,
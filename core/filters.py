@@ -1,6 +1,8 @@
+from datetime import datetime, timedelta
 from django.db.models import QuerySet, Q
+from django.utils import timezone
 from django_filters import rest_framework as filters
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from .models import DataPoint
 
 
@@ -28,6 +30,54 @@ class MetricRangeFilter(filters.NumberFilter):
         )
 
 
+def is_date_only(raw: str) -> bool:
+    """True si el valor ISO 8601 trae solo la fecha (sin parte horaria 'T...' ni ' ...')."""
+    raw = (raw or '').strip()
+    return bool(raw) and 'T' not in raw and ' ' not in raw
+
+
+def end_bound(value: datetime, raw: str) -> Tuple[datetime, bool]:
+    """Retorna (límite, inclusivo) para `end_date`: con fecha sola, la medianoche siguiente y exclusivo (todo el día)."""
+    if is_date_only(raw):
+        return value + timedelta(days=1), False
+    return value, True
+
+
+def parse_iso_datetime(raw: str) -> datetime:
+    """Parsea un query param ISO 8601; las fechas sin zona se interpretan en la hora local. Lanza ValueError si es inválido."""
+    value = datetime.fromisoformat(raw.strip())
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def parse_end_bound(raw: str) -> Tuple[datetime, bool]:
+    """Como `end_bound`, parseando el texto del query param."""
+    return end_bound(parse_iso_datetime(raw), raw)
+
+
+def end_bound_q(bound: datetime, inclusive: bool) -> Q:
+    """Límite superior sobre timestamp como rango (no con __date), así los índices sobre la columna siguen sirviendo."""
+    return Q(timestamp__lte=bound) if inclusive else Q(timestamp__lt=bound)
+
+
+def _metric_ranges_q(valid_ranges: Dict[str, Dict[str, Any]]) -> Q:
+    """Construye el Q de rangos válidos por métrica; las métricas no definidas pasan sin filtro."""
+    metric_filter = Q()
+    
+    # Construir Q object para todos los rangos de métricas válidas.
+    for metric, ranges in valid_ranges.items():
+        metric_filter |= (
+            Q(metric=metric) & 
+            Q(value__gte=ranges['min']) & 
+            Q(value__lte=ranges['max'])
+        )
+    
+    # Permitir métricas no definidas en VALID_RANGES (sin filtro de rango para ellas).
+    metric_filter |= ~Q(metric__in=list(valid_ranges.keys()))
+    return metric_filter
+
+
 class DataPointFilter(filters.FilterSet):
     """Conjunto de filtros para DataPoint: rangos de fecha, sensores, rangos de valor por métrica y opción de último valor."""
     VALID_RANGES = { # Rangos de valores aceptables por métrica
@@ -35,12 +85,13 @@ class DataPointFilter(filters.FilterSet):
         'h': {'min': 2, 'max': 100},
         's': {'min': 2, 'max': 99}
     }
+    METRIC_RANGES_Q = _metric_ranges_q(VALID_RANGES) # Se arma una vez al importar, no en cada request
     
     timestamp_after = filters.IsoDateTimeFilter(field_name='timestamp', lookup_expr='gte')
-    timestamp_before = filters.IsoDateTimeFilter(field_name='timestamp', lookup_expr='lte')
+    timestamp_before = filters.IsoDateTimeFilter(method='filter_end_date')
     
     start_date = filters.IsoDateTimeFilter(field_name='timestamp', lookup_expr='gte')
-    end_date = filters.IsoDateTimeFilter(field_name='timestamp', lookup_expr='lte')
+    end_date = filters.IsoDateTimeFilter(method='filter_end_date')
     
     sensors = filters.CharFilter(method='filter_sensors')
     
@@ -66,6 +117,12 @@ class DataPointFilter(filters.FilterSet):
         sensor_list = [s.strip() for s in value.split(',')]
         return queryset.filter(sensor__in=sensor_list)
 
+    def filter_end_date(self, queryset, name, value):
+        """Filtra hasta `value` inclusive; si se pasó solo la fecha (YYYY-MM-DD) incluye el día completo."""
+        if value is None:
+            return queryset
+        return queryset.filter(end_bound_q(*end_bound(value, self.data.get(name, ''))))
+
     def filter_latest_only(self, queryset, name, value):
         """Filtra queryset para devolver solo el DataPoint más reciente por sensor si 'value' es True."""
         if value:
@@ -84,20 +141,7 @@ class DataPointFilter(filters.FilterSet):
             
         return queryset
     
-    def apply_metric_ranges(self, queryset: QuerySet) -> QuerySet:
-        """Aplica rangos de valor válidos para métricas conocidas ('t', 'h', 's') mediante un objeto Q."""
-        metric_filter = Q()
-        
-        # Construir Q object para todos los rangos de métricas válidas.
-        for metric, ranges in self.VALID_RANGES.items():
-            metric_filter |= (
-                Q(metric=metric) & 
-                Q(value__gte=ranges['min']) & 
-                Q(value__lte=ranges['max'])
-            )
-        
-        # Permitir métricas no definidas en VALID_RANGES (sin filtro de rango para ellas).
-        defined_metrics = list(self.VALID_RANGES.keys())
-        metric_filter |= ~Q(metric__in=defined_metrics)
-        
-        return queryset.filter(metric_filter)
\ No newline at end of file
+    @classmethod
+    def apply_metric_ranges(cls, queryset: QuerySet) -> QuerySet:
+        """Aplica rangos de valor válidos para métricas conocidas ('t', 'h', 's') mediante el Q precalculado."""
+        return queryset.filter(cls.METRIC_RANGES_Q)
@@ -0,0 +1,76 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from loguru import logger
+
+from core.utils import get_start_date
+from core.views import InteractiveView
+
+
+class Command(BaseCommand):
+    help = (
+        'Pre-renderiza el gráfico interactivo para combinaciones frecuentes de timeframe y métricas y lo guarda '
+        'en la caché compartida, para que InteractiveView lo sirva sin consultar la base ni generar el gráfico.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--timeframes', default='1t,30t,1h,4h,1d',
+            help="Timeframes separados por coma (por defecto, los botones de la vista interactiva)."
+        )
+        parser.add_argument(
+            '--metrics', nargs='+', default=['t', 'h', 't,h'],
+            help="Combinaciones de métricas; cada una separada por coma (p. ej. --metrics t h t,h)."
+        )
+        parser.add_argument('--room', action='store_true', help='Pre-renderizar también la agrupación por sala.')
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help=(
+                'Segundos entre pasadas; con 0 se ejecuta una sola vez (p. ej. desde cron). Conviene que sea menor que el '
+                'TTL más corto de los timeframes elegidos (frecuencia de re-muestreo con tope CHART_CACHE_TIMEOUT); '
+                'el comando informa cada TTL al iniciar.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        if 'locmem' in settings.CACHES['default']['BACKEND'].lower():
+            logger.warning("warm_charts: la caché es LocMemCache por proceso; los workers web no verán los gráficos (definir REDIS_URL)")
+
+        timeframes = [tf.strip().lower() for tf in options['timeframes'].split(',') if tf.strip()]
+        metric_sets = [
+            [m.strip().lower() for m in combo.split(',') if m.strip()] for combo in options['metrics']
+        ]
+        room_options = [False, True] if options['room'] else [False]
+
+        now = timezone.now()
+        timeouts = {timeframe: InteractiveView.chart_cache_timeout(get_start_date(timeframe, now), now) for timeframe in timeframes}
+        self.stdout.write("warm_charts: TTL por timeframe: " + ', '.join(f"{tf}={int(ttl)}s" for tf, ttl in timeouts.items()))
+        if timeouts and 0 < min(timeouts.values()) <= options['interval']:
+            logger.warning(
+                f"warm_charts: --interval={options['interval']}s no es menor que el TTL más corto ({int(min(timeouts.values()))}s); "
+                "esos gráficos vencerán entre pasadas"
+            )
+
+        while True:
+            start_time = time.time()
+            view = InteractiveView()
+            for timeframe in timeframes:
+                for metrics in metric_sets:
+                    for room_grouping_active in room_options:
+                        end_date = timezone.now()
+                        start_date = get_start_date(timeframe, end_date)
+                        chart_context = view.build_chart_context(
+                            metrics, timeframe, room_grouping_active, start_date, end_date
+                        )
+                        view.cache_chart_context(
+                            view.chart_cache_key(metrics, timeframe, room_grouping_active),
+                            chart_context, start_date, end_date
+                        )
+            count = len(timeframes) * len(metric_sets) * len(room_options)
+            self.stdout.write(f"warm_charts: {count} gráficos pre-renderizados en {time.time() - start_time:.2f}s")
+
+            if options['interval'] <= 0:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_datapoint_core_datapo_sensor_f186fa_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='datapoint',
+            index=models.Index(fields=['timestamp', 'metric', 'sensor'], name='core_datapo_timesta_7a1903_idx'),
+        ),
+    ]
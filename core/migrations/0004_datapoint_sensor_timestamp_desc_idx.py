@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_datapoint_core_datapo_timesta_7a1903_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='datapoint',
+            index=models.Index(fields=['sensor', '-timestamp'], name='core_datapo_sensor_90dd64_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='datapoint',
+            index=models.Index(fields=['sensor', 'metric', '-timestamp'], name='core_datapo_sensor_827979_idx'),
+        ),
+    ]
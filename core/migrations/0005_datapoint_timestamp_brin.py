@@ -0,0 +1,28 @@
+# Generated by Django 5.1.3 on 2026-10-16 12:00
+
+from django.db import migrations
+
+
+# BRIN solo existe en PostgreSQL; en otros motores (p. ej. SQLite en desarrollo) la migración no hace nada
+def create_timestamp_brin(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS core_datapoint_timestamp_brin '
+            'ON core_datapoint USING BRIN ("timestamp") WITH (pages_per_range = 32)'
+        )
+
+
+def drop_timestamp_brin(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS core_datapoint_timestamp_brin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_datapoint_sensor_timestamp_desc_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_timestamp_brin, drop_timestamp_brin),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-16 12:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_datapoint_timestamp_brin'),
+    ]
+
+    # El btree simple sobre timestamp queda redundante: el BRIN (0005) y (timestamp, metric, sensor) cubren los rangos
+    operations = [
+        migrations.RemoveIndex(
+            model_name='datapoint',
+            name='core_datapo_timesta_9ad9a4_idx',
+        ),
+    ]
@@ -30,7 +30,7 @@ class Sensor(models.Model):
 
 
 class DataPoint(models.Model):
-    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
+    timestamp = models.DateTimeField(default=timezone.now)
     sensor = models.CharField(max_length=255, db_index=True)
     metric = models.CharField(max_length=1, db_index=True)
     value = models.FloatField()
@@ -38,10 +38,14 @@ class DataPoint(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['sensor', 'timestamp']),
-            models.Index(fields=['timestamp']),
             models.Index(fields=['sensor', 'metric', 'timestamp']),
             models.Index(fields=['sensor', 'metric', 'value']),
             models.Index(fields=['metric', 'timestamp']),
+            # Con timestamp al frente sirve también los rangos por tiempo; en PostgreSQL además está el BRIN de la migración 0005
+            models.Index(fields=['timestamp', 'metric', 'sensor']),
+            # Orden mixto para los "último valor por sensor" (DISTINCT ON ... ORDER BY sensor[, metric], timestamp DESC)
+            models.Index(fields=['sensor', '-timestamp']),
+            models.Index(fields=['sensor', 'metric', '-timestamp']),
         ]
 
     def __str__(self):
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Room, Sensor
+from .utils import bump_sensor_room_map_version
+
+
+@receiver([post_save, post_delete], sender=Sensor)
+@receiver([post_save, post_delete], sender=Room)
+def clear_sensor_room_map_cache(sender, **kwargs):
+    """Invalida el mapeo sensor -> room cacheado (en todos los workers) cuando cambian sensores o salas."""
+    bump_sensor_room_map_version()
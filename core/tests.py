@@ -0,0 +1,277 @@
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .api import TimeframedData
+from .filters import is_date_only
+from .models import DataPoint, Room, Sensor
+from .utils import DataPointDataFrameBuilder, FirstByTimestamp, LastByTimestamp
+
+
+class DataPointBulkTests(TestCase):
+    """POST /api/data-point/bulk/: validación, tope de tamaño y respuesta con el conteo."""
+    url = '/api/data-point/bulk/'
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_bulk_creates_rows_and_returns_count(self):
+        payload = [
+            {'sensor': 'rpi-001', 'metric': 't', 'value': 24.5},
+            {'sensor': 'rpi-001', 'metric': 'h', 'value': 61.2},
+        ]
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'created': 2})
+        self.assertEqual(DataPoint.objects.count(), 2)
+
+    def test_bulk_rejects_invalid_items(self):
+        payload = [
+            {'sensor': 'rpi-001', 'metric': 't', 'value': 24.5},
+            {'sensor': 'rpi-001', 'metric': 't', 'value': 'no-es-numero'},
+        ]
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('value', response.json()[1])
+        self.assertEqual(DataPoint.objects.count(), 0)
+
+    def test_bulk_rejects_lists_over_max_items(self):
+        payload = [{'sensor': 'rpi-001', 'metric': 't', 'value': 20.0}] * 4
+        with mock.patch('core.api.BULK_MAX_ITEMS', 3):
+            response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('detail', response.json())
+        self.assertEqual(DataPoint.objects.count(), 0)
+
+
+@override_settings(TIME_ZONE='America/Argentina/Mendoza')
+class EndDateFilterTests(TestCase):
+    """`end_date` con fecha sola incluye el día completo en el listado y en /latest/."""
+
+    @classmethod
+    def setUpTestData(cls):
+        late_in_day = datetime(2024, 1, 2, 22, 0, tzinfo=dt_timezone.utc)  # 19:00 del 02/01 en hora argentina
+        DataPoint.objects.create(timestamp=late_in_day, sensor='rpi-001', metric='t', value=21.0)
+        DataPoint.objects.create(timestamp=late_in_day + timedelta(days=1), sensor='rpi-001', metric='t', value=22.0)
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+
+    def test_is_date_only(self):
+        self.assertTrue(is_date_only('2024-01-02'))
+        self.assertTrue(is_date_only(' 2024-01-02 '))
+        self.assertFalse(is_date_only('2024-01-02T00:00:00'))
+        self.assertFalse(is_date_only('2024-01-02 10:00'))
+        self.assertFalse(is_date_only('2024-01-02T00:00:00-03:00'))
+        self.assertFalse(is_date_only(''))
+
+    def test_list_includes_the_whole_end_day(self):
+        response = self.client.get('/api/data-point/', {'start_date': '2024-01-01', 'end_date': '2024-01-02'})
+        self.assertEqual([r['value'] for r in response.json()['results']], [21.0])
+
+    def test_list_keeps_datetime_end_inclusive(self):
+        response = self.client.get('/api/data-point/', {'start_date': '2024-01-01', 'end_date': '2024-01-02T12:00:00'})
+        self.assertEqual(response.json()['results'], [])
+
+    def test_latest_includes_the_whole_end_day(self):
+        response = self.client.get('/api/data-point/latest/', {'start_date': '2024-01-01', 'end_date': '2024-01-02'})
+        self.assertEqual([r['value'] for r in response.json()['results']], [21.0])
+
+    def test_latest_accepts_offset_aware_start_date(self):
+        response = self.client.get('/api/data-point/latest/', {'start_date': '2024-01-02T00:00:00-03:00', 'end_date': '2024-01-02'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['value'] for r in response.json()['results']], [21.0])
+
+    def test_latest_rejects_invalid_dates(self):
+        response = self.client.get('/api/data-point/latest/', {'start_date': 'ayer'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(TIME_ZONE='America/Argentina/Mendoza')
+class DataPointExportTests(TestCase):
+    """GET /api/data-point/export/: rango obligatorio y acotado, descarga como archivo."""
+    url = '/api/data-point/export/'
+
+    @classmethod
+    def setUpTestData(cls):
+        timestamp = datetime(2024, 1, 2, 15, 0, tzinfo=dt_timezone.utc)
+        DataPoint.objects.create(timestamp=timestamp, sensor='rpi-001', metric='t', value=21.0)
+        DataPoint.objects.create(timestamp=timestamp, sensor='rpi-001', metric='h', value=60.0)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_export_requires_start_date(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_rejects_ranges_over_the_limit(self):
+        response = self.client.get(self.url, {'start_date': '2024-01-01', 'end_date': '2024-03-01'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_rejects_invalid_dates(self):
+        response = self.client.get(self.url, {'start_date': 'ayer'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_streams_the_filtered_rows_as_an_attachment(self):
+        response = self.client.get(self.url, {'start_date': '2024-01-01', 'end_date': '2024-01-02'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment', response['Content-Disposition'])
+        records = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(sorted(r['metric'] for r in records), ['h', 't'])
+        self.assertEqual(records[0]['timestamp'], '2024-01-02T12:00:00-03:00')
+
+
+class _EdgeBySQLite:
+    """Agregado SQLite (valor, orden) que conserva el valor de la fila extrema según `later`."""
+    later = False
+
+    def __init__(self):
+        self.value = self.ordering = None
+
+    def step(self, value, ordering):
+        if self.ordering is None or (ordering > self.ordering if self.later else ordering < self.ordering):
+            self.value, self.ordering = value, ordering
+
+    def finalize(self):
+        return self.value
+
+
+class _LastBySQLite(_EdgeBySQLite):
+    later = True
+
+
+def _sqlite_date_bin(interval_us, timestamp, origin):
+    """date_bin de PostgreSQL sobre los textos UTC con los que SQLite guarda los DateTimeField."""
+    timestamp = datetime.fromisoformat(timestamp)
+    origin = datetime.fromisoformat(origin)
+    step = timedelta(microseconds=interval_us)
+    return (origin + ((timestamp - origin) // step) * step).isoformat(sep=' ')
+
+
+def _sqlite_edge_sql(function):
+    def as_sqlite(self, compiler, connection, **extra_context):
+        expression, ordering = self.get_source_expressions()[:2]
+        expression_sql, expression_params = compiler.compile(expression)
+        ordering_sql, ordering_params = compiler.compile(ordering)
+        return f"{function}({expression_sql}, {ordering_sql})", (*expression_params, *ordering_params)
+    return as_sqlite
+
+
+class TimeframedDataPathsTests(TestCase):
+    """El GROUP BY en la base (PostgreSQL) y el camino con pandas devuelven los mismos buckets y valores.
+
+    En PostgreSQL se ejecuta el SQL real; en SQLite date_bin y first/last se emulan con funciones registradas
+    en la conexión, de modo que se prueba el armado de la consulta y de los registros sobre el mismo fixture.
+    """
+    NOW = datetime(2026, 1, 15, 2, 30, tzinfo=dt_timezone.utc)  # 23:30 del 14/01 en hora argentina
+
+    @classmethod
+    def setUpTestData(cls):
+        room = Room.objects.create(name='Sala A')
+        Sensor.objects.create(name='s1', room=room)
+        Sensor.objects.create(name='s2', room=room)
+        # s3 no está registrado: en la agrupación por sala cae en ''
+        points = []
+        for k in range(300):  # una lectura cada 7 minutos durante ~35h, cruzando la medianoche UTC y la local
+            for index, sensor in enumerate(('s1', 's2', 's3')):
+                # Sin empates de timestamp dentro de una sala, para que first/last estén bien definidos
+                timestamp = cls.NOW - timedelta(minutes=7 * k, seconds=30 + 10 * index)
+                points.append(DataPoint(timestamp=timestamp, sensor=sensor, metric='t', value=20 + (k * 7 + index) % 13 * 0.37))
+                points.append(DataPoint(timestamp=timestamp, sensor=sensor, metric='h', value=50 + (k * 5 + index) % 11 * 1.13))
+        DataPoint.objects.bulk_create(points)
+
+    def setUp(self):
+        if connection.vendor == 'sqlite':
+            connection.ensure_connection()
+            connection.connection.create_function('date_bin', 3, _sqlite_date_bin)
+            connection.connection.create_aggregate('first_by', 2, _EdgeBySQLite)
+            connection.connection.create_aggregate('last_by', 2, _LastBySQLite)
+            for aggregate, function in ((FirstByTimestamp, 'first_by'), (LastByTimestamp, 'last_by')):
+                patcher = mock.patch.object(aggregate, 'as_sqlite', _sqlite_edge_sql(function), create=True)
+                patcher.start()
+                self.addCleanup(patcher.stop)
+        patcher = mock.patch('django.utils.timezone.now', return_value=self.NOW)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run(self, vendor, **query_parameters):
+        processor = TimeframedData(DataPoint.objects.all(), query_parameters)
+        with mock.patch('core.api.connections', {'default': SimpleNamespace(vendor=vendor)}):
+            return processor.get()
+
+    def test_db_and_pandas_paths_return_the_same_records(self):
+        for timeframe in ('30T', '1H', '4H', '1D'):
+            for aggregations in ('false', 'true'):
+                for include_room in ('false', 'true'):
+                    parameters = {'timeframe': timeframe, 'aggregations': aggregations, 'include_room': include_room}
+                    with self.subTest(**parameters):
+                        pandas_records = self._run('sqlite', **parameters)
+                        db_records = self._run('postgresql', **parameters)
+                        self.assertTrue(pandas_records)
+                        self.assertRecordsEqual(db_records, pandas_records)
+
+    @override_settings(TIME_ZONE='America/Argentina/Mendoza')
+    def test_chart_builder_db_and_pandas_paths_return_the_same_local_timestamps(self):
+        """date_bin (PostgreSQL) y Trunc* + pd.Grouper dan los mismos buckets en hora local, sin corrimiento UTC.
+
+        Con 4H el camino Trunc* promedia los promedios por hora (cantidades distintas por hora), así que ahí se comparan
+        solo los buckets; con 30T (Trunc por minuto, una lectura por minuto y sensor) también los valores.
+        """
+        for timeframe in ('30T', '4H'):
+            for pivot_metrics in (False, True):
+                with self.subTest(timeframe=timeframe, pivot_metrics=pivot_metrics):
+                    frames = {}
+                    for vendor in ('sqlite', 'postgresql'):
+                        builder = DataPointDataFrameBuilder(timeframe=timeframe, metrics=['t', 'h'], pivot_metrics=pivot_metrics)
+                        with mock.patch('core.utils.connections', {'default': SimpleNamespace(vendor=vendor)}):
+                            df = builder.build(DataPoint.objects.all())
+                        frames[vendor] = df.sort_values([c for c in ('sensor', 'metric', 'timestamp') if c in df]).reset_index(drop=True)
+                    pandas_df, db_df = frames['sqlite'], frames['postgresql']
+                    self.assertFalse(pandas_df.empty)
+                    self.assertEqual(str(db_df['timestamp'].dt.tz), 'America/Argentina/Mendoza')
+                    if timeframe == '4H':
+                        keys = [c for c in ('sensor', 'metric', 'timestamp') if c in pandas_df]
+                        pd.testing.assert_frame_equal(db_df[keys], pandas_df[keys])
+                    else:
+                        pd.testing.assert_frame_equal(db_df, pandas_df, atol=0.011, check_exact=False)
+
+    def assertRecordsEqual(self, records, expected):
+        """Mismos buckets, claves y valores; los valores se comparan con tolerancia de redondeo (AVG y mean suman en distinto orden)."""
+        self.assertEqual(len(records), len(expected))
+        for record, expected_record in zip(records, expected):
+            self.assertEqual({k: v for k, v in record.items() if k != 'value'}, {k: v for k, v in expected_record.items() if k != 'value'})
+            values, expected_values = record['value'], expected_record['value']
+            if isinstance(expected_values, dict):
+                self.assertEqual(values.keys(), expected_values.keys())
+                for name, expected_value in expected_values.items():
+                    self.assertAlmostEqual(values[name], expected_value, delta=0.011, msg=f"{name} en {record}")
+            else:
+                self.assertAlmostEqual(values, expected_values, delta=0.011, msg=str(record))
+
+    def test_first_and_last_are_the_edge_readings_of_each_bucket(self):
+        records = self._run('postgresql', timeframe='1H', aggregations='true')
+        # Último bucket de s1/t: el primero queda recortado por el inicio de la ventana
+        record = [r for r in records if r['sensor'] == 's1' and r['metric'] == 't'][-1]
+        bucket_start = datetime.fromisoformat(record['timestamp'])
+        readings = list(
+            DataPoint.objects.filter(
+                sensor='s1', metric='t', timestamp__gte=bucket_start, timestamp__lt=bucket_start + timedelta(hours=1)
+            ).order_by('timestamp').values_list('value', flat=True)
+        )
+        self.assertEqual(record['value']['first'], round(readings[0], 2))
+        self.assertEqual(record['value']['last'], round(readings[-1], 2))
+
+    def test_daily_buckets_start_at_utc_midnight(self):
+        for vendor in ('sqlite', 'postgresql'):
+            with self.subTest(vendor=vendor):
+                buckets = {r['timestamp'] for r in self._run(vendor, timeframe='1D')}
+                self.assertEqual(buckets, {'2026-01-13T00:00:00+00:00', '2026-01-14T00:00:00+00:00', '2026-01-15T00:00:00+00:00'})
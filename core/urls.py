@@ -11,7 +11,9 @@ from .views import (
     VPDView,
     GaugesView,
     GenerateGaugeView,
-    GenerateSensorView
+    GenerateSensorView,
+    GenerateSensorJSONView,
+    GenerateSensorImageView
 )
 
 router = DefaultRouter()
@@ -27,5 +29,7 @@ urlpatterns = [
     path('charts/gauges/', GaugesView.as_view(), name='gauges'),
     path('generate_gauge/', GenerateGaugeView.as_view(), name='generate-gauge'),
     path('generate_sensor/', GenerateSensorView.as_view(), name='generate_sensor'),
+    path('generate_sensor/json/', GenerateSensorJSONView.as_view(), name='generate_sensor_json'),
+    path('generate_sensor/png/', GenerateSensorImageView.as_view(), name='generate_sensor_png'),
     path('', include(router.urls)),
 ]
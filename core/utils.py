@@ -1,12 +1,23 @@
-from datetime import timedelta, datetime
+from datetime import timedelta, datetime, timezone as dt_timezone
 import pandas as pd
 from django.utils import timezone
-from django.db.models import Avg, Func
+from django.db import connections
+from django.core.cache import cache
+from django.db.models import Aggregate, Avg, Func, Value, DateTimeField, FloatField
 from django.db.models.functions import TruncSecond, TruncMinute, TruncHour, TruncDay
 from .models import DataPoint, Sensor
 from loguru import logger
 import numpy as np
+import time
 from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 TIMEFRAME_MAP = {
     '5S': '5S',
@@ -17,6 +28,84 @@ TIMEFRAME_MAP = {
     '1D': '1D'
 }
 
+# Intervalo de cada timeframe de TIMEFRAME_MAP para agrupar en la base con date_bin
+TIMEFRAME_BIN_INTERVALS = {
+    '5S': timedelta(seconds=5),
+    '1T': timedelta(minutes=1),
+    '30T': timedelta(minutes=30),
+    '1H': timedelta(hours=1),
+    '4H': timedelta(hours=4),
+    '1D': timedelta(days=1)
+}
+
+# Ventana de tiempo mostrada para cada timeframe de la UI
+TIMEFRAME_WINDOWS = {
+    '5S': timedelta(minutes=3, seconds=45),
+    '1T': timedelta(minutes=45),
+    '30T': timedelta(hours=9),
+    '1H': timedelta(hours=18),
+    '4H': timedelta(days=3),
+    '1D': timedelta(days=10, hours=12)
+}
+
+# Alias aceptados en la URL para los timeframes en minutos
+TIMEFRAME_ALIASES = {
+    '1MIN': '1T',
+    '1M': '1T',
+    '30MIN': '30T',
+    '30M': '30T'
+}
+
+# Función de truncamiento en la base según el tipo devuelto por _get_db_trunc_kind
+DB_TRUNC_CLASSES = {
+    'second': TruncSecond,
+    'minute': TruncMinute,
+    'hour': TruncHour,
+    'day': TruncDay
+}
+
+# Origen de date_bin en medianoche UTC. El ORM entrega los timestamps en UTC, así que pd.Grouper (origen 'start_day')
+# también corta los buckets a partir de las 00:00 UTC: los de 1D no empiezan en la medianoche local, en ninguno de
+# los dos caminos (ver TimeframedDataPathsTests en core/tests.py)
+DATE_BIN_ORIGIN = datetime(2000, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class DateBin(Func):
+    """date_bin de PostgreSQL (>= 14): agrupa el timestamp en intervalos fijos contados desde `origin` (DATE_BIN_ORIGIN por defecto)."""
+    function = 'date_bin'
+    output_field = DateTimeField()
+
+    def __init__(self, interval, expression, origin=DATE_BIN_ORIGIN, **extra):
+        super().__init__(Value(interval), expression, Value(origin), **extra)
+
+
+def local_date_bin_origin():
+    """Medianoche local del 2000-01-01: buckets alineados como los de Trunc* y pd.Grouper sobre timestamps en hora local."""
+    return datetime(2000, 1, 1, tzinfo=timezone.get_current_timezone())
+
+
+class FirstByTimestamp(Aggregate):
+    """Valor de la fila más antigua del grupo (PostgreSQL); equivale a 'first' de pandas sobre filas ordenadas por timestamp."""
+    function = 'ARRAY_AGG'
+    ordering_direction = 'ASC'
+    output_field = FloatField()
+
+    def __init__(self, expression, ordering='timestamp', **extra):
+        super().__init__(expression, ordering, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        expression, ordering = self.get_source_expressions()[:2]
+        expression_sql, expression_params = compiler.compile(expression)
+        ordering_sql, ordering_params = compiler.compile(ordering)
+        # El array se indexa dentro de la base: por grupo sale un único valor, no el array completo
+        sql = f"({self.function}({expression_sql} ORDER BY {ordering_sql} {self.ordering_direction}))[1]"
+        return sql, (*expression_params, *ordering_params)
+
+
+class LastByTimestamp(FirstByTimestamp):
+    """Valor de la fila más reciente del grupo (PostgreSQL); equivale a 'last' de pandas."""
+    ordering_direction = 'DESC'
+
 METRIC_MAP = {
     't': 'Temperatura',
     'h': 'Humedad',
@@ -111,23 +200,34 @@ def to_bool(value):
 
 
 def get_timedelta_from_timeframe(timeframe):
-    time_windows = {
-        '5S': timedelta(minutes=3, seconds=45),
-        '1T': timedelta(minutes=45),
-        '30T': timedelta(hours=9),
-        '1H': timedelta(hours=18),
-        '4H': timedelta(days=3),
-        '1D': timedelta(days=10, hours=12)
-    }
-    return time_windows[timeframe.upper()]
+    return TIMEFRAME_WINDOWS[timeframe.upper()]
+
+# Versión del mapeo sensor -> room en la caché compartida: la incrementa core/signals.py al cambiar sensores o salas,
+# así cada worker descarta su copia en memoria aunque el cambio se haya guardado en otro proceso
+SENSOR_ROOM_MAP_VERSION_KEY = 'sensor_room_map:version'
+
+def _get_sensor_room_map_version():
+    # Valor inicial distinto en cada creación: si la clave se pierde, ninguna copia vieja coincide con la nueva
+    return cache.get_or_set(SENSOR_ROOM_MAP_VERSION_KEY, time.time_ns, None)
+
+def bump_sensor_room_map_version():
+    """Invalida el mapeo sensor -> room en todos los procesos que comparten la caché."""
+    try:
+        cache.incr(SENSOR_ROOM_MAP_VERSION_KEY)
+    except ValueError:
+        cache.set(SENSOR_ROOM_MAP_VERSION_KEY, time.time_ns(), None)
+
+@lru_cache(maxsize=1)
+def _build_sensor_room_map(version):
+    return dict(Sensor.objects.values_list('name', 'room__name'))
+
+def get_sensor_room_map():
+    """Retorna mapeo sensor -> room.name cacheado en memoria (no mutar); se reconstruye cuando cambia la versión compartida."""
+    return _build_sensor_room_map(_get_sensor_room_map_version())
 
 def get_start_date(timeframe, end_date):
     timeframe = timeframe.upper()
-    
-    if timeframe == '1MIN' or timeframe == '1M':
-        timeframe = '1T'
-    elif timeframe == '30MIN' or timeframe == '30M':
-        timeframe = '30T'
+    timeframe = TIMEFRAME_ALIASES.get(timeframe, timeframe)
         
     try:
         time_delta = get_timedelta_from_timeframe(timeframe)
@@ -137,35 +237,39 @@ def get_start_date(timeframe, end_date):
         logger.warning(f"get_start_date: Unrecognized timeframe '{timeframe}', defaulting to 1T")
         return end_date - timedelta(hours=3)
 
+@lru_cache(maxsize=64)
 def normalize_timeframe(timeframe):
     return timeframe.lower().replace('t', 'min').lower()
 
+@lru_cache(maxsize=64)
+def get_freq_timedelta(freq):
+    """Retorna el pd.Timedelta de una frecuencia pandas ('5s', '30min', '4h'...), parseado una sola vez por proceso."""
+    return pd.Timedelta(freq)
+
 def create_timeframed_dataframe(data_points, timeframe, start_date, end_date):
     normalized_tf = normalize_timeframe(timeframe)
     full_date_range = pd.date_range(start=start_date, end=end_date, freq=normalized_tf)
 
-    df_calendar = pd.DataFrame({'timestamp': full_date_range, 'value': pd.NA})
+    df_result = pd.DataFrame({'value': pd.NA}, index=full_date_range.rename('timestamp'))
     
-    df_datapoints = pd.DataFrame(list(data_points.values('timestamp', 'value')))
-    df_datapoints['timestamp'] = pd.to_datetime(df_datapoints['timestamp'], utc=True)
+    data_points_rows = list(data_points.values_list('timestamp', 'value'))
+    timestamps, values = zip(*data_points_rows) if data_points_rows else ((), ())
+    df_datapoints = pd.DataFrame({
+        'timestamp': pd.to_datetime(timestamps, utc=True),
+        'value': np.array(values, dtype='float64'),
+    })
     
-    if not df_datapoints.empty:
-        df_datapoints = df_datapoints.sort_values('timestamp')
-        df_calendar_sorted = df_calendar.sort_values('timestamp').rename(columns={'timestamp': 'calendar'})
-        df_datapoints['calendar'] = pd.merge_asof(
-            df_datapoints[['timestamp']],
-            df_calendar_sorted[['calendar']],
-            left_on='timestamp',
-            right_on='calendar',
-            direction='backward'
-        )['calendar']
-        df_datapoints = df_datapoints.groupby('calendar', as_index=False)['value'].mean()
-        df_datapoints['value'] = df_datapoints['value'].apply(lambda x: round(x, 1))
+    if not df_datapoints.empty and not full_date_range.empty:
+        # El calendario es regular: cada punto cae en origen + k * paso (equivale al merge_asof 'backward')
+        calendar_origin = full_date_range[0]
+        calendar_step = get_freq_timedelta(normalized_tf)
+        bins = (df_datapoints['timestamp'] - calendar_origin) // calendar_step
+        calendar = (calendar_origin + bins * calendar_step).clip(upper=full_date_range[-1])
+        aggregated_values = df_datapoints['value'].groupby(calendar, sort=False, observed=True).mean().round(1)
+        # Asignación alineada por índice: los slots del calendario sin datos quedan como NaN
+        df_result['value'] = aggregated_values
         
-    df_result = pd.merge(df_calendar, df_datapoints, left_on='timestamp', right_on='calendar', how='left', suffixes=('', '_agg'))
-    df_result['value'] = df_result['value_agg'].combine_first(df_result['value'])
-    df_result.drop('value_agg', axis=1, inplace=True)
-    df_result = df_result.reset_index(drop=True)
+    df_result = df_result.reset_index()
     
     return df_result
 
@@ -179,6 +283,7 @@ def calculate_vpd(t, h):
     vp = svp * (h / 100) # VP actual basada en humedad relativa
     return svp - vp
 
+@lru_cache(maxsize=64)
 def get_actual_timedelta_from_string(timeframe_str: str) -> timedelta:
     timeframe_str = str(timeframe_str).upper()
     try:
@@ -222,7 +327,8 @@ def get_active_sensor_names(timeframe_str: str, end_date: datetime, metrics_list
         active_data_points = active_data_points.filter(sensor__in=initial_sensor_names)
         logger.debug(f"get_active_sensor_names: Filtering by initial_sensor_names: {len(initial_sensor_names)} sensors")
     
-    distinct_sensor_names = list(active_data_points.values_list('sensor', flat=True).distinct())
+    # order_by() vacío: sin ORDER BY el DISTINCT puede resolverse con el índice (timestamp, metric, sensor)
+    distinct_sensor_names = list(active_data_points.order_by().values_list('sensor', flat=True).distinct())
     logger.debug(f"get_active_sensor_names: Found {len(distinct_sensor_names)} active sensors: {distinct_sensor_names}")
     
     return distinct_sensor_names
@@ -244,7 +350,9 @@ class DataPointDataFrameBuilder:
         else:
             return self.end_date - timedelta(days=365)
 
-    def _get_db_trunc_kind(self, timeframe):
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _get_db_trunc_kind(timeframe):
         """Determina el tipo de truncamiento de base de datos basado en el timeframe."""
         tf = timeframe.lower()
         if 's' in tf: return 'second'
@@ -253,6 +361,18 @@ class DataPointDataFrameBuilder:
         if 'd' in tf: return 'day'
         return 'minute' # Default safe fallback
 
+    @staticmethod
+    def _get_db_bin_interval(timeframe):
+        """Intervalo fijo para date_bin si el timeframe es menor a un día y lo divide exacto; None si no aplica."""
+        try:
+            interval = pd.Timedelta(pd.tseries.frequencies.to_offset(timeframe))
+        except (ValueError, TypeError):
+            return None
+        seconds = interval.total_seconds()
+        if 0 < seconds < 86400 and 86400 % seconds == 0:
+            return interval.to_pytimedelta()
+        return None
+
     def _get_data_points_values(self, datapoint_qs=None):
         queryset = datapoint_qs if datapoint_qs is not None else DataPoint.objects.all()
         
@@ -263,39 +383,27 @@ class DataPointDataFrameBuilder:
         logger.debug(f"DataPointDataFrameBuilder: Querying for metrics {self.metrics} from {self.start_date} to {self.end_date}")
         
         # Optimization: Use DB aggregation instead of fetching all rows
-        trunc_kind = self._get_db_trunc_kind(self.timeframe)
-        
-        # Mapping for dynamic Trunc class
-        trunc_classes = {
-            'second': TruncSecond,
-            'minute': TruncMinute,
-            'hour': TruncHour,
-            'day': TruncDay
-        }
-        TruncClass = trunc_classes.get(trunc_kind, TruncMinute)
-
-        logger.debug(f"DataPointDataFrameBuilder: Using DB aggregation with {trunc_kind}")
+        bin_interval = self._get_db_bin_interval(self.timeframe)
+        if bin_interval is not None and connections[queryset.db].vendor == 'postgresql':
+            # date_bin agrupa directo al intervalo pedido (p. ej. 5 min): una fila por bucket final en lugar de una por minuto.
+            # Origen en medianoche local, igual que Trunc* y el pd.Grouper de build() (p. ej. buckets de 4h desde las 00:00 locales)
+            period = DateBin(bin_interval, 'timestamp', origin=local_date_bin_origin())
+            logger.debug(f"DataPointDataFrameBuilder: Using DB aggregation with date_bin {bin_interval}")
+        else:
+            trunc_kind = self._get_db_trunc_kind(self.timeframe)
+            TruncClass = DB_TRUNC_CLASSES.get(trunc_kind, TruncMinute)
+            period = TruncClass('timestamp')
+            logger.debug(f"DataPointDataFrameBuilder: Using DB aggregation with {trunc_kind}")
 
         aggregated_qs = queryset.annotate(
-            period=TruncClass('timestamp')
+            period=period
         ).values('period', 'sensor', 'metric').annotate(
             value=Avg('value')
         ).order_by('period')
         
-        # Log count of aggregated rows vs potential raw rows (estimated)
-        # Note: count() on aggregated query returns number of groups
-        count = aggregated_qs.count() 
-        logger.debug(f"DataPointDataFrameBuilder: Retrieved {count} aggregated data points from DB")
-        
-        # Convert to list and rename 'period' to 'timestamp' to match expected interface
-        values = []
-        for item in aggregated_qs:
-            values.append({
-                'timestamp': item['period'],
-                'sensor': item['sensor'],
-                'metric': item['metric'],
-                'value': item['value']
-            })
+        # Tuplas (period, sensor, metric, value); evita un dict por fila
+        values = list(aggregated_qs.values_list('period', 'sensor', 'metric', 'value'))
+        logger.debug(f"DataPointDataFrameBuilder: Retrieved {len(values)} aggregated data points from DB")
             
         return values
 
@@ -313,13 +421,13 @@ class DataPointDataFrameBuilder:
             
             if isinstance(pivot_df.columns, pd.MultiIndex):
                 logger.debug(f"_pivot_by_metrics: Column levels: {pivot_df.columns.names}")
-                logger.debug(f"_pivot_by_metrics: Column values: {pivot_df.columns.tolist()}")
+                logger.opt(lazy=True).debug("_pivot_by_metrics: Column values: {}", lambda: pivot_df.columns.tolist())
             else:
-                logger.debug(f"_pivot_by_metrics: Columns: {pivot_df.columns.tolist()}")
+                logger.opt(lazy=True).debug("_pivot_by_metrics: Columns: {}", lambda: pivot_df.columns.tolist())
 
             if isinstance(pivot_df.columns, pd.MultiIndex):
                 pivot_df.columns = [col[1] for col in pivot_df.columns]
-                logger.debug(f"_pivot_by_metrics: After column simplification: {pivot_df.columns.tolist()}")
+                logger.opt(lazy=True).debug("_pivot_by_metrics: After column simplification: {}", lambda: pivot_df.columns.tolist())
             else:
                 logger.warning("_pivot_by_metrics: Expected MultiIndex for columns but got simple Index")
 
@@ -337,14 +445,21 @@ class DataPointDataFrameBuilder:
         # If use_last is needed, we should query separately.
         
         data = self._get_data_points_values(datapoint_qs=datapoint_qs)
-        df = pd.DataFrame(data)
-        
-        if df.empty:
+        if not data:
             logger.warning("DataPointDataFrameBuilder.build: No data found, returning empty DataFrame")
-            return df
+            return pd.DataFrame()
+
+        # Columnas tipadas construidas una sola vez en el borde con la base (sin inferencia fila a fila)
+        timestamps, sensors, metrics, values = zip(*data)
+        df = pd.DataFrame({
+            # date_bin devuelve UTC y Trunc* hora local: se unifica en la zona actual, que es la que muestran los gráficos
+            'timestamp': pd.to_datetime(timestamps, utc=True).tz_convert(timezone.get_current_timezone()),
+            'sensor': np.array(sensors, dtype=object),
+            'metric': np.array(metrics, dtype=object),
+            'value': np.array(values, dtype='float64'),
+        })
 
-        logger.debug(f"DataPointDataFrameBuilder.build: Initial DataFrame has {len(df)} rows with columns {df.columns.tolist()}")
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        logger.opt(lazy=True).debug("DataPointDataFrameBuilder.build: Initial DataFrame has {} rows with columns {}", lambda: len(df), lambda: df.columns.tolist())
 
         # Since data is already aggregated by DB to the nearest unit (e.g. minute), 
         # we might still need to resample if the requested timeframe is '5T' but we aggregated to '1T'.
@@ -353,9 +468,12 @@ class DataPointDataFrameBuilder:
         try:
             if self.pivot_metrics:
                 logger.debug("DataPointDataFrameBuilder.build: Using pivot_metrics approach")
-                # We still group by to ensure exact alignment with requested timeframe (e.g. 5T)
+                # We still group by to ensure exact alignment with requested timeframe (e.g. 5T).
+                # Un único groupby con pd.Grouper ya es una sola pasada hash sobre todas las series;
+                # pivotear a ancho (timestamp x sensor/métrica) + resample resultó más lento (el pivot domina).
                 aggregated_df = df.groupby(
-                    ['sensor', 'metric', pd.Grouper(key='timestamp', freq=self.timeframe)]
+                    ['sensor', 'metric', pd.Grouper(key='timestamp', freq=self.timeframe)],
+                    sort=False, observed=True
                 )[['value']].mean()
                 
                 logger.debug(f"DataPointDataFrameBuilder.build: Aggregated DataFrame has shape {aggregated_df.shape}")
@@ -364,7 +482,7 @@ class DataPointDataFrameBuilder:
                 if df.empty:
                     logger.warning("DataPointDataFrameBuilder.build: Pivoted DataFrame is empty")
                 else:
-                    logger.debug(f"DataPointDataFrameBuilder.build: Pivoted DataFrame has shape {df.shape} and columns {df.columns.tolist()}")
+                    logger.opt(lazy=True).debug("DataPointDataFrameBuilder.build: Pivoted DataFrame has shape {} and columns {}", lambda: df.shape, lambda: df.columns.tolist())
                 
                 df = df.reset_index()
             else:
@@ -380,16 +498,15 @@ class DataPointDataFrameBuilder:
             if df.empty:
                 logger.warning("DataPointDataFrameBuilder.build: Final DataFrame is empty")
             else:
-                logger.debug(f"DataPointDataFrameBuilder.build: Final DataFrame has {len(df)} rows with columns {df.columns.tolist()}")
-                if len(df) > 0:
-                    logger.debug(f"DataPointDataFrameBuilder.build: First row sample: {df.iloc[0].to_dict()}")
+                logger.opt(lazy=True).debug("DataPointDataFrameBuilder.build: Final DataFrame has {} rows with columns {}", lambda: len(df), lambda: df.columns.tolist())
+                # lazy: la muestra (df.iloc[0].to_dict()) solo se arma si el nivel DEBUG está activo
+                logger.opt(lazy=True).debug("DataPointDataFrameBuilder.build: First row sample: {}", lambda: df.iloc[0].to_dict())
             
             if self.add_room_information and not df.empty and 'sensor' in df.columns:
                 logger.debug("DataPointDataFrameBuilder.build: Adding room information to DataFrame.")
-                sensors_map_qs = Sensor.objects.select_related('room').all()
-                sensor_to_room_map_internal = {s.name: s.room.name if s.room else "No Room" for s in sensors_map_qs}
-                df['room'] = df['sensor'].apply(lambda s: sensor_to_room_map_internal.get(s, "No Room"))
-                logger.debug(f"DataPointDataFrameBuilder.build: DataFrame with room info has columns {df.columns.tolist()}")
+                sensor_to_room_map_internal = get_sensor_room_map()
+                df['room'] = df['sensor'].map(sensor_to_room_map_internal).fillna("No Room")
+                logger.opt(lazy=True).debug("DataPointDataFrameBuilder.build: DataFrame with room info has columns {}", lambda: df.columns.tolist())
 
             return df
         except Exception as e:
@@ -399,13 +516,13 @@ class DataPointDataFrameBuilder:
     def group_by_room(self, latest=False, sensors=True):
         df = self.build()
 
-        sensores = Sensor.objects.all()
-        sensor_room_map = {sensor.name: sensor.room.name if sensor.room else None for sensor in sensores}
+        sensor_room_map = get_sensor_room_map()
 
-        df['room'] = df['sensor'].apply(lambda sensor: sensor_room_map.get(sensor, ''))
+        df['room'] = df['sensor'].map(sensor_room_map).fillna('')
 
         if latest:
-            df = df.sort_values(by=['timestamp'], ascending=False).groupby('sensor').head(1)
+            # idxmax por sensor es O(N); evita ordenar todo el DataFrame para quedarse con una fila por grupo
+            df = df.loc[df.groupby('sensor', sort=False, observed=True)['timestamp'].idxmax()]
 
         if not sensors:
             df = df.drop('sensor', axis=1, errors='ignore')
@@ -425,32 +542,83 @@ def calculate_optimal_frequency(total_seconds, target_points):
     if seconds_per_point < 86400: return f"{int(round(seconds_per_point/3600))}h"
     return f"{int(round(seconds_per_point/86400))}d"
 
-def prepare_vpd_chart_data(df_grouped_chart):
-    data_for_chart = []
-    if df_grouped_chart is not None:
-        for room, group in df_grouped_chart:
-            if 't' in group.columns and 'h' in group.columns:
-                avg_t = group['t'].mean()
-                avg_h = group['h'].mean()
-                if pd.notna(avg_t) and pd.notna(avg_h):
-                    data_for_chart.append((room, avg_t, avg_h))
-    return data_for_chart
+def _lttb_kernel(x, y, n_out):
+    """Bucle LTTB escalar sobre arrays float64 contiguos; se compila con numba si está instalado."""
+    n = x.shape[0]
+    # n_out - 2 buckets entre el primer y el último punto, que siempre se conservan
+    bucket_edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[n_out - 1] = n - 1
+
+    selected = 0
+    for i in range(n_out - 2):
+        start = bucket_edges[i]
+        end = bucket_edges[i + 1]
+        next_end = bucket_edges[i + 2] if i + 2 < n_out - 1 else n
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(end, next_end):
+            avg_x += x[j]
+            avg_y += y[j]
+        avg_x /= next_end - end
+        avg_y /= next_end - end
+
+        max_area = -1.0
+        max_index = start
+        for j in range(start, end):
+            area = abs(
+                (x[selected] - avg_x) * (y[j] - y[selected])
+                - (x[selected] - x[j]) * (avg_y - y[selected])
+            )
+            if area > max_area:
+                max_area = area
+                max_index = j
+        selected = max_index
+        indices[i + 1] = selected
+    return indices
+
+if NUMBA_AVAILABLE:
+    _lttb_kernel = njit(cache=True, fastmath=True)(_lttb_kernel)
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: índices de los n_out puntos que preservan la forma visual de la serie (x creciente, sin NaN)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.ascontiguousarray(x, dtype='float64')
+    y = np.ascontiguousarray(y, dtype='float64')
+    # Sin numba el kernel corre como Python puro: misma implementación, más lenta
+    return _lttb_kernel(x, y, n_out)
+
+def warm_up_lttb():
+    """Compila (o carga desde la caché de numba) el kernel LTTB para que el primer gráfico no pague la compilación."""
+    if NUMBA_AVAILABLE:
+        lttb_indices(np.arange(4, dtype='float64'), np.zeros(4), 3)
+
+def lttb_downsample(df, x_column, y_column, n_out):
+    """Reduce df a n_out filas con LTTB sobre (x_column, y_column); x_column debe ser datetime y df estar ordenado por ella."""
+    if len(df) <= n_out:
+        return df
+    x = pd.DatetimeIndex(df[x_column]).asi8
+    return df.iloc[lttb_indices(x, df[y_column].to_numpy(), n_out)]
 
 def prepare_sensors_view_data(start_date, end_date, metric_map, metric_order, sensors_qs, datapoint_qs):
     data = {}
     all_sensor_metrics = {}
     sensor_names = [sensor.name for sensor in sensors_qs if sensor.room]
+    metric_rank = {metric_code: rank for rank, metric_code in enumerate(metric_order)}
+    unranked = len(metric_order)
 
     if sensor_names:
         metrics_by_sensor_values = datapoint_qs.filter(
             sensor__in=sensor_names,
             timestamp__gte=start_date,
             timestamp__lte=end_date
-        ).values('sensor', 'metric').distinct()
+        ).values_list('sensor', 'metric').distinct()
         
-        for item in metrics_by_sensor_values:
-            sensor_name = item['sensor']
-            metric = item['metric']
+        for sensor_name, metric in metrics_by_sensor_values:
             if sensor_name not in all_sensor_metrics:
                 all_sensor_metrics[sensor_name] = set()
             all_sensor_metrics[sensor_name].add(metric)
@@ -469,14 +637,7 @@ def prepare_sensors_view_data(start_date, end_date, metric_map, metric_order, se
             logger.debug(f"Sensor '{sensor.name}' en sala '{room_name}' no tiene datos en el rango de tiempo.")
             continue
 
-        ordered_metrics_for_sensor = OrderedDict()
-        for metric_code in metric_order:
-            if metric_code in sensor_metrics:
-                ordered_metrics_for_sensor[metric_code] = None
-
-        for metric_code in sorted(sensor_metrics):
-            if metric_code not in ordered_metrics_for_sensor:
-                ordered_metrics_for_sensor[metric_code] = None
+        ordered_metrics_for_sensor = sorted(sensor_metrics, key=lambda m: (metric_rank.get(m, unranked), m))
 
         for metric_code in ordered_metrics_for_sensor:
             metric_full_name = metric_map.get(metric_code, metric_code)
@@ -490,45 +651,61 @@ def prepare_sensors_view_data(start_date, end_date, metric_map, metric_order, se
                 data[room_name][metric_code]['sensors'].append(sensor.name)
 
     for room_name, room_data in data.items():
-        ordered_room_data = OrderedDict()
-        for metric_code in metric_order:
-            if metric_code in room_data:
-                ordered_room_data[metric_code] = room_data[metric_code]
-        for metric_code in room_data:
-            if metric_code not in ordered_room_data:
-                ordered_room_data[metric_code] = room_data[metric_code]
-        data[room_name] = ordered_room_data
+        # sorted es estable: las métricas fuera de metric_order conservan su orden de inserción
+        data[room_name] = OrderedDict(
+            sorted(room_data.items(), key=lambda item: metric_rank.get(item[0], unranked))
+        )
         
     return data
 
+GAUGE_SORT_KEY = itemgetter('metric', 'sensor_name')
+
 def prepare_gauges_view_data(cutoff_date, sensors_qs, datapoint_qs):
-    latest_data_points_values = datapoint_qs.filter(timestamp__gte=cutoff_date).order_by(
+    # Semi-join en SQL contra sensors_qs (sin materializar sensores en Python); la sala sale del mapeo cacheado
+    latest_data_points_values = datapoint_qs.filter(
+        timestamp__gte=cutoff_date,
+        sensor__in=sensors_qs.values('name')
+    ).order_by(
         'sensor', 'metric', '-timestamp'
-    ).distinct('sensor', 'metric').values('sensor', 'metric', 'value', 'timestamp')
+    ).distinct('sensor', 'metric').values_list('sensor', 'metric', 'value', 'timestamp')
 
-    sensors_dict = {sensor.name: sensor for sensor in sensors_qs.select_related('room')}
+    sensor_room_map = get_sensor_room_map()
 
+    # Tuplas en lugar de dicts intermedios: cada fila se desempaqueta directo en el dict del gauge
     gauges_by_room = {}
-    for data_point_values in latest_data_points_values:
-        sensor_obj = sensors_dict.get(data_point_values['sensor'])
-        if sensor_obj:
-            room_name = sensor_obj.room.name if sensor_obj.room else "No Room"
-            if room_name not in gauges_by_room:
-                gauges_by_room[room_name] = []
-
-            gauges_by_room[room_name].append({
-                'value': data_point_values['value'],
-                'metric': data_point_values['metric'],
-                'sensor_name': data_point_values['sensor'],
-                'timestamp': data_point_values['timestamp'].isoformat() if data_point_values['timestamp'] else None,
-            })
-
-    for room_name, gauges in gauges_by_room.items():
-        gauges.sort(key=lambda x: (x['metric'], x['sensor_name']))
+    for sensor_name, metric, value, timestamp in latest_data_points_values:
+        room_name = sensor_room_map.get(sensor_name) or "No Room"
+        if room_name not in gauges_by_room:
+            gauges_by_room[room_name] = []
+
+        gauges_by_room[room_name].append({
+            'value': value,
+            'metric': metric,
+            'sensor_name': sensor_name,
+            'timestamp': timestamp.isoformat() if timestamp else None,
+        })
+
+    for gauges in gauges_by_room.values():
+        gauges.sort(key=GAUGE_SORT_KEY)
     
     return gauges_by_room
 
-def prepare_vpd_table_data(start_date, end_date, metrics, sensors_qs, datapoint_qs_manager):
+# Ventana de lecturas para los gauges
+GAUGES_LOOKBACK = timedelta(hours=24)
+# Segundos de cada bucket de la caché de gauges: las requests del mismo bucket comparten una sola consulta
+GAUGES_CACHE_TIMEOUT = 5
+
+def get_recent_gauges_view_data():
+    """Gauges de las últimas `GAUGES_LOOKBACK`, cacheados por bucket de `GAUGES_CACHE_TIMEOUT` segundos (compartido entre workers)."""
+    bucket = int(time.time()) // GAUGES_CACHE_TIMEOUT
+    cutoff_date = datetime.fromtimestamp(bucket * GAUGES_CACHE_TIMEOUT, dt_timezone.utc) - GAUGES_LOOKBACK
+    return cache.get_or_set(
+        f"gauges:{bucket}",
+        lambda: prepare_gauges_view_data(cutoff_date, Sensor.objects.all(), DataPoint.objects),
+        GAUGES_CACHE_TIMEOUT
+    )
+
+def prepare_vpd_table_data(start_date, end_date, metrics, sensors_qs=None, datapoint_qs_manager=None):
     table_builder = DataPointDataFrameBuilder(
         timeframe='5Min',
         start_date=start_date,
@@ -543,12 +720,16 @@ def prepare_vpd_table_data(start_date, end_date, metrics, sensors_qs, datapoint_
         return pd.DataFrame()
 
     if 'timestamp' in df_table.columns:
-        df_table['timestamp'] = pd.to_datetime(df_table['timestamp'])
+        if not pd.api.types.is_datetime64_any_dtype(df_table['timestamp']):
+            df_table['timestamp'] = pd.to_datetime(df_table['timestamp'])
     else:
         logger.warning("prepare_vpd_table_data: 'timestamp' column missing from df_table.")
 
-    sensor_room_map = {sensor.name: sensor.room.name if sensor.room else "No Room" for sensor in sensors_qs}
-    df_table['room'] = df_table['sensor'].apply(lambda s: sensor_room_map.get(s, "No Instalado"))
+    if sensors_qs is None:
+        sensor_room_map = get_sensor_room_map()
+    else:
+        sensor_room_map = {sensor.name: sensor.room.name if sensor.room else "No Room" for sensor in sensors_qs}
+    df_table['room'] = df_table['sensor'].map(sensor_room_map).fillna("No Instalado")
     
     if 't' in df_table.columns and 'h' in df_table.columns:
         df_table['vpd'] = df_table.apply(lambda row: calculate_vpd(row['t'], row['h']), axis=1)
@@ -565,18 +746,15 @@ def filter_dataframe_by_min_points(df, group_by_column, metrics, min_data_points
         logger_instance.warning(f"filter_dataframe_by_min_points: DataFrame is empty or missing '{group_by_column}' column.")
         return df.copy(), excluded_items_list 
 
-    valid_items_to_plot = []
-    for item_name, group_data in df.groupby(group_by_column):
-        total_item_points = 0
-        for metric_code in metrics:
-            if metric_code in group_data.columns:
-                total_item_points += group_data[metric_code].count()
-        
-        if total_item_points >= min_data_points_for_display:
-            valid_items_to_plot.append(item_name)
-        else:
-            excluded_items_list.append(item_name)
-            logger_instance.info(f"filter_dataframe_by_min_points: Excluding '{item_name}' due to insufficient data ({total_item_points} points)")
+    # Un único groupby-count vectorizado: puntos no nulos por item sumados sobre todas las métricas presentes
+    metrics_present = [metric_code for metric_code in metrics if metric_code in df.columns]
+    points_per_item = df.groupby(group_by_column, sort=False, observed=True)[metrics_present].count().sum(axis=1)
+
+    is_valid = points_per_item >= min_data_points_for_display
+    valid_items_to_plot = points_per_item.index[is_valid].tolist()
+    for item_name, total_item_points in points_per_item[~is_valid].items():
+        excluded_items_list.append(item_name)
+        logger_instance.info(f"filter_dataframe_by_min_points: Excluding '{item_name}' due to insufficient data ({total_item_points} points)")
     
     if valid_items_to_plot:
         df_filtered = df[df[group_by_column].isin(valid_items_to_plot)].copy()
@@ -1,14 +1,14 @@
+from django.conf import settings
 from django.views.generic import TemplateView, View
 from django.http import HttpResponse
+from django.core.cache import cache
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from collections import OrderedDict
 from .models import DataPoint, Sensor
-from .charts import gauge_plot, sensor_plot, vpd_plot, interactive_chart
+from .charts import gauge_plot, sensor_plot, sensor_plot_json, sensor_plot_image, vpd_plot, interactive_chart, CHART_CACHE_TIMEOUT
 from .utils import (
     get_timedelta_from_timeframe, 
-    create_timeframed_dataframe,
     METRIC_MAP,
     DataPointDataFrameBuilder,
     pretty_datetime, 
@@ -18,8 +18,10 @@ from .utils import (
     filter_dataframe_by_min_points,
     calculate_vpd,
     prepare_sensors_view_data,
-    prepare_gauges_view_data,
-    get_active_sensor_names
+    get_recent_gauges_view_data,
+    get_active_sensor_names,
+    get_sensor_room_map,
+    get_freq_timedelta
 )
 import pandas as pd
 import time
@@ -41,13 +43,8 @@ class GaugesView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        cutoff_date = timezone.now() - timezone.timedelta(hours=24)
-        
-        context['gauges_by_room'] = prepare_gauges_view_data(
-            cutoff_date, 
-            Sensor.objects.all(), 
-            DataPoint.objects
-        )
+        # Varios dashboards cargando a la vez reutilizan la misma consulta (ver GAUGES_CACHE_TIMEOUT)
+        context['gauges_by_room'] = get_recent_gauges_view_data()
         return context
 
 
@@ -177,11 +174,32 @@ class SensorsView(TemplateView):
 
 @method_decorator(csrf_exempt, name='dispatch')
 class GenerateSensorView(View):
+    cache_prefix = 'sensor_chart_html'
+
+    def render_chart(self, df, sensor_name, metric, timeframe, start_date, end_date):
+        return sensor_plot(df, sensor_name, metric, timeframe, start_date, end_date)
+
+    def chart_response(self, chart):
+        return HttpResponse(chart)
+
+    def no_data_response(self):
+        return HttpResponse(f"<div class='no-data-alert'>No hay datos disponibles.</div>")
+
     def post(self, request):
+        return self.render_sensor_chart(request.POST)
+
+    def render_sensor_chart(self, params):
         start_time = time.time()
-        sensor_name = request.POST.get('sensor')
-        timeframe = request.POST.get('timeframe', '4h').lower()
-        metric = request.POST.get('metric', '')
+        sensor_name = params.get('sensor')
+        timeframe = params.get('timeframe', '4h').lower()
+        metric = params.get('metric', '')
+        
+        # HTML prerenderizado por (sensor, métrica, timeframe): los refrescos dentro del mismo período
+        # de agregación no vuelven a consultar la base ni a generar el gráfico
+        cache_key = f"{self.cache_prefix}:{sensor_name}:{metric}:{timeframe}"
+        chart = cache.get(cache_key)
+        if chart is not None:
+            return self.chart_response(chart)
         
         end_date = timezone.now()
         
@@ -189,7 +207,7 @@ class GenerateSensorView(View):
         # because the sensor was already filtered in SensorsView.
         # If we reached here, it's likely valid, or we handle empty data gracefully below.
             
-        start_date = timezone.now() - get_timedelta_from_timeframe(timeframe)
+        start_date = end_date - get_timedelta_from_timeframe(timeframe)
         
         # Optimization: Use optimized DataPointDataFrameBuilder with DB aggregation
         # Determine optimal frequency based on timeframe to reduce data points
@@ -214,14 +232,49 @@ class GenerateSensorView(View):
         
         if df.empty:
              logger.warning(f"No hay datos para sensor='{sensor_name}', metric='{metric}' en rango {timeframe} (post-optimization)")
-             return HttpResponse(f"<div class='no-data-alert'>No hay datos disponibles.</div>")
+             return self.no_data_response()
 
-        chart_html, count = sensor_plot(df, sensor_name, metric, timeframe, start_date, end_date)
+        chart, count = self.render_chart(df, sensor_name, metric, timeframe, start_date, end_date)
+        if chart is None:
+            return self.no_data_response()
+        cache.set(cache_key, chart, min(get_freq_timedelta(optimal_freq).total_seconds(), CHART_CACHE_TIMEOUT))
         
         total_time = time.time() - start_time
         logger.debug(f"Gráfico para {sensor_name}/{metric}: {count} puntos en {total_time:.2f}s (Optimized)")
         
-        return HttpResponse(chart_html)
+        return self.chart_response(chart)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class GenerateSensorJSONView(GenerateSensorView):
+    """Como GenerateSensorView, pero retorna la figura en JSON para actualizarla en el cliente con Plotly.react."""
+    cache_prefix = 'sensor_chart_json'
+
+    def render_chart(self, df, sensor_name, metric, timeframe, start_date, end_date):
+        return sensor_plot_json(df, sensor_name, metric, timeframe, start_date, end_date)
+
+    def chart_response(self, chart):
+        return HttpResponse(chart, content_type='application/json')
+
+    def no_data_response(self):
+        return HttpResponse(status=204)
+
+
+class GenerateSensorImageView(GenerateSensorView):
+    """Como GenerateSensorView, pero retorna un PNG estático (Kaleido) para usos no interactivos, p.ej. un <img src>."""
+    cache_prefix = 'sensor_chart_png'
+
+    def get(self, request):
+        return self.render_sensor_chart(request.GET)
+
+    def render_chart(self, df, sensor_name, metric, timeframe, start_date, end_date):
+        return sensor_plot_image(df, sensor_name, metric, timeframe, start_date, end_date)
+
+    def chart_response(self, chart):
+        return HttpResponse(chart, content_type='image/png')
+
+    def no_data_response(self):
+        return HttpResponse(status=204)
 
 
 class VPDView(TemplateView):
@@ -242,7 +295,8 @@ class VPDView(TemplateView):
             timestamp__lte=now
         ).order_by('sensor', 'metric', '-timestamp').distinct('sensor', 'metric')
 
-        latest_data_values = list(latest_data_points_qs.values('sensor', 'metric', 'value', 'timestamp'))
+        # Tuplas en lugar de dicts y sin timestamp: el pivot solo usa sensor, metric y value
+        latest_data_values = list(latest_data_points_qs.values_list('sensor', 'metric', 'value'))
 
         if not latest_data_values:
             logger.info(f"VPDView: No 't' or 'h' data points found for any sensor in the last {lookback_period_for_latest}.")
@@ -250,7 +304,7 @@ class VPDView(TemplateView):
             context['chart'] = vpd_plot([])
             return context
             
-        df_latest_sensor_metrics = pd.DataFrame(latest_data_values)
+        df_latest_sensor_metrics = pd.DataFrame.from_records(latest_data_values, columns=['sensor', 'metric', 'value'])
 
         # Pivot to get t and h values side-by-side for each sensor
         df_sensor_th = df_latest_sensor_metrics.pivot_table(
@@ -269,8 +323,7 @@ class VPDView(TemplateView):
             context['chart'] = vpd_plot([])
             return context
 
-        sensors_qs_for_room_info = Sensor.objects.filter(name__in=unique_sensor_names_from_data).select_related('room')
-        sensor_to_room_map = {s.name: s.room.name if s.room else "No Room" for s in sensors_qs_for_room_info}
+        sensor_to_room_map = get_sensor_room_map()
         
         df_sensor_th['room'] = df_sensor_th['sensor'].map(sensor_to_room_map)
         df_sensor_th = df_sensor_th[df_sensor_th['room'] != "No Room"]
@@ -290,7 +343,7 @@ class VPDView(TemplateView):
             return context
 
         # Calculate VPD for each sensor
-        df_sensor_th['vpd'] = df_sensor_th.apply(lambda row: calculate_vpd(row['t'], row['h']), axis=1)
+        df_sensor_th['vpd'] = calculate_vpd(df_sensor_th['t'].astype(float), df_sensor_th['h'].astype(float))
         
         # Data for the table (list of sensor dicts with room, sensor, t, h, vpd)
         context['room_data'] = df_sensor_th[['room', 'sensor', 't', 'h', 'vpd']].to_dict(orient='records')
@@ -304,11 +357,10 @@ class VPDView(TemplateView):
                 avg_h=('h', 'mean')
             ).reset_index()
 
-            data_for_chart = [
-                (row['room'], row['avg_t'], row['avg_h'])
-                for _, row in df_room_level_for_chart.iterrows()
-                if pd.notna(row['avg_t']) and pd.notna(row['avg_h'])
-            ]
+            data_for_chart = list(
+                df_room_level_for_chart.dropna(subset=['avg_t', 'avg_h'])
+                .itertuples(index=False, name=None)
+            )
         
         chart_html = vpd_plot(data_for_chart)
         context['chart'] = chart_html
@@ -341,11 +393,11 @@ class GenerateGaugeView(View):
 
 class InteractiveView(TemplateView):
     template_name = 'charts/interactive.html'
+    cache_prefix = 'interactive_view'
     TARGET_POINTS = 120
     MIN_DATA_POINTS_FOR_DISPLAY = 20
 
     def get_context_data(self, **kwargs):
-        start_time = time.time()
         context = super().get_context_data(**kwargs)
 
         timeframe = self.request.GET.get('timeframe', '1h').lower()
@@ -357,6 +409,16 @@ class InteractiveView(TemplateView):
             
         room_grouping_active = to_bool(self.request.GET.get('room', 'false'))
 
+        # Sin fechas explícitas la ventana es relativa a ahora: se reutiliza el gráfico ya calculado
+        # para (métricas, timeframe, room) mientras dure un período de agregación
+        cache_key = None
+        if not self.request.GET.get('start_date') and not self.request.GET.get('end_date'):
+            cache_key = self.chart_cache_key(metrics, timeframe, room_grouping_active)
+            cached_context = cache.get(cache_key)
+            if cached_context is not None:
+                context.update(cached_context)
+                return context
+
         end_date = timezone.now()
         if end_date_str := self.request.GET.get('end_date'):
             try:
@@ -371,6 +433,30 @@ class InteractiveView(TemplateView):
             except ValueError:
                 logger.warning(f"InteractiveView: Invalid start_date format: {start_date_str}")
         
+        chart_context = self.build_chart_context(metrics, timeframe, room_grouping_active, start_date, end_date)
+        context.update(chart_context)
+        if cache_key is not None:
+            self.cache_chart_context(cache_key, chart_context, start_date, end_date)
+        return context
+
+    @classmethod
+    def chart_cache_key(cls, metrics, timeframe, room_grouping_active):
+        """Clave del contexto cacheado para una ventana relativa a ahora (sin start_date/end_date explícitos)."""
+        return f"{cls.cache_prefix}:{','.join(metrics)}:{timeframe}:{room_grouping_active}"
+
+    @classmethod
+    def chart_cache_timeout(cls, start_date, end_date):
+        """Segundos que vale el contexto cacheado: la frecuencia de re-muestreo de la ventana, acotada a CHART_CACHE_TIMEOUT."""
+        resampling_freq = calculate_optimal_frequency((end_date - start_date).total_seconds(), cls.TARGET_POINTS)
+        return min(get_freq_timedelta(resampling_freq).total_seconds(), CHART_CACHE_TIMEOUT)
+
+    def cache_chart_context(self, cache_key, chart_context, start_date, end_date):
+        """Guarda el contexto por un período de agregación (ver chart_cache_timeout)."""
+        cache.set(cache_key, chart_context, self.chart_cache_timeout(start_date, end_date))
+
+    def build_chart_context(self, metrics, timeframe, room_grouping_active, start_date, end_date):
+        """Consulta, filtra y grafica; retorna el contexto del gráfico (no depende del request, lo usa también warm_charts)."""
+        start_time = time.time()
         logger.debug(f"InteractiveView: Time range: {start_date} to {end_date} ({timeframe})")
 
         df = self._fetch_sensor_data(metrics, start_date, end_date, room_grouping_active, timeframe)
@@ -405,16 +491,14 @@ class InteractiveView(TemplateView):
             'query_duration_s': round(query_duration, 3)
         }
         
-        context.update({
+        logger.info(f"InteractiveView: Completed in {query_duration:.3f}s with {plotted_points} points plotted. Excluded: {len(excluded_items_list)} items.")
+        return {
             'metadata': metadata,
             'room': room_grouping_active,
             'chart_html': chart_html,
             'plotted_points': plotted_points,
             'target_points': self.TARGET_POINTS if not room_grouping_active else plotted_points
-        })
-        
-        logger.info(f"InteractiveView: Completed in {query_duration:.3f}s with {plotted_points} points plotted. Excluded: {len(excluded_items_list)} items.")
-        return context
+        }
     
     def _fetch_sensor_data(self, metrics, start_date, end_date, room_grouping_active, timeframe):
         actual_time_window = end_date - start_date
@@ -445,7 +529,9 @@ class InteractiveView(TemplateView):
             logger.debug("InteractiveView: No raw data points in time range for active sensors.")
             return pd.DataFrame()
         
-        logger.debug(f"InteractiveView: Found {data_points_qs.count()} raw data points for active sensors in time range.")
+        if settings.DEBUG:
+            # El COUNT(*) recorre toda la ventana solo para este log: no se ejecuta en producción
+            logger.debug(f"InteractiveView: Found {data_points_qs.count()} raw data points for active sensors in time range.")
 
         # Calculate optimal frequency once
         actual_resampling_freq = calculate_optimal_frequency(total_seconds_for_optimal_freq, self.TARGET_POINTS)
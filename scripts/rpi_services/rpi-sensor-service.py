@@ -20,6 +20,7 @@ import os
 from abc import ABC, abstractmethod
 import datetime
 import requests
+import threading
 import time
 from loguru import logger
 from pathlib import Path
@@ -196,6 +197,18 @@ class APITransmitter(TransmitterInterface):
     def __init__(self, api_urls, raspberry_id):
         self.api_urls = api_urls.split(',')  # Convertir string de URLs en lista
         self.raspberry_id = raspberry_id
+        # Una Session por hilo: reutiliza las conexiones (keep-alive) en lugar de abrir un TCP/TLS nuevo por lectura,
+        # sin compartir la misma Session entre los envíos concurrentes de asyncio.to_thread (no es thread-safe)
+        self._local = threading.local()
+
+    def _get_session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _post(self, url, payload):
+        return self._get_session().post(url, json=payload, timeout=5)  # 5 seconds timeout
     
     async def send_data(self, sensor, metric, value):
         payload = {
@@ -206,12 +219,7 @@ class APITransmitter(TransmitterInterface):
         
         async def send_to_url(url):
             try:
-                response = await asyncio.to_thread(
-                    requests.post,
-                    url.strip(),
-                    json=payload,
-                    timeout=5  # 5 seconds timeout
-                )
+                response = await asyncio.to_thread(self._post, url.strip(), payload)
                 if response.status_code == 201:
                     logger.info(f"{url} - {sensor} {metric}: {value} - ✅")
                 else: